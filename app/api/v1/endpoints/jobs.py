@@ -0,0 +1,36 @@
+from fastapi import APIRouter, HTTPException, Depends, status
+
+from app.core.auth import verify_api_key
+from app.schemas.jobs import Job, JobCreateRequest
+from app.services.job_service import JobQueueFull, job_service
+
+router = APIRouter()
+
+
+@router.post(
+    '',
+    response_model=Job,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(verify_api_key)],
+)
+async def create_job(request: JobCreateRequest) -> Job:
+
+    try:
+        return await job_service.submit(request.url, force_refresh=request.force_refresh)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.get('/{job_id}', response_model=Job, dependencies=[Depends(verify_api_key)])
+async def get_job(job_id: str) -> Job:
+
+    job = await job_service.get(job_id)
+
+    if not job:
+        raise HTTPException(
+            status_code=404, detail="Задача не найдена"
+        )
+
+    return job
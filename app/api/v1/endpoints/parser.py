@@ -1,6 +1,13 @@
-from fastapi import APIRouter, HTTPException, Depends
+import json
+import time
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from app.core.auth import verify_api_key
+from app.schemas.batch import BatchParseRequest
+from app.schemas.stream import TenderStreamEvent
 from app.schemas.tender import TenderData
 from app.services.parser_service import parser
 
@@ -8,13 +15,80 @@ router = APIRouter()
 
 
 @router.post('/parse', response_model=TenderData, dependencies=[Depends(verify_api_key)])
-async def parse(url: str) -> TenderData:
+async def parse(
+    url: str,
+    response: Response,
+    force_refresh: bool = False,
+    meta: bool = Query(False, description="Добавить в ответ блок _meta со временем этапов"),
+) -> TenderData:
+    """Парсинг тендера; время этапов отдается в заголовке Server-Timing"""
+    started = time.perf_counter()
 
-    tender = await parser.start_parsing(url)
+    tender, trace = await parser.parse_traced(url, force_refresh=force_refresh)
 
     if not tender:
         raise HTTPException(
             status_code=404, detail="Тендер не обработан"
         )
 
+    total = time.perf_counter() - started
+    headers = {"Server-Timing": trace.server_timing(total)}
+    if meta:
+        content = tender.model_dump(mode="json")
+        content["_meta"] = trace.to_meta(total).model_dump(mode="json")
+        return JSONResponse(content, headers=headers)
+
+    response.headers.update(headers)
     return tender
+
+
+@router.post('/parse/batch', dependencies=[Depends(verify_api_key)])
+async def parse_batch(request: BatchParseRequest) -> StreamingResponse:
+    """Пакетный парсинг: по строке NDJSON на тендер в порядке готовности"""
+
+    async def lines():
+        async for result in parser.parse_batch(
+            request.urls,
+            concurrency=request.concurrency,
+            force_refresh=request.force_refresh,
+        ):
+            # Вложенные данные отдаются как в /parse, вместе с пустыми полями
+            unused = {"error"} if result.status == "ok" else {"data"}
+            yield result.model_dump_json(exclude=unused) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.post('/parse/stream', dependencies=[Depends(verify_api_key)])
+async def parse_stream(
+    url: str,
+    force_refresh: bool = False,
+    format: Literal["ndjson", "sse"] = "ndjson",
+) -> StreamingResponse:
+    """Потоковый парсинг: основная информация, позиции по страницам, затем документы"""
+
+    events = parser.stream_parsing(url, force_refresh=force_refresh)
+
+    def encode(event: TenderStreamEvent) -> str:
+        if format == "sse":
+            data = json.dumps(event.model_dump(mode="json")["data"], ensure_ascii=False)
+            return f"event: {event.event}\ndata: {data}\n\n"
+        return event.model_dump_json() + "\n"
+
+    async def lines():
+        try:
+            async for event in events:
+                yield encode(event)
+        except Exception as e:
+            yield encode(TenderStreamEvent(event="error", data={"detail": str(e) or repr(e)}))
+        finally:
+            await events.aclose()
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(lines(), media_type=media_type)
+
+
+@router.get('/cache', dependencies=[Depends(verify_api_key)])
+async def cache_stats() -> dict:
+    """Статистика кэша результатов"""
+    return parser.cache.stats()
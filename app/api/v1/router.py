@@ -1,8 +1,9 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import parser
+from app.api.v1.endpoints import jobs, parser
 
 api_router = APIRouter()
 
 # Подключаем эндпоинты
 api_router.include_router(parser.router, prefix="/parser", tags=["parser"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
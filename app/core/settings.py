@@ -1,3 +1,5 @@
+from typing import Dict, List, Optional
+
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -7,6 +9,73 @@ class Settings(BaseSettings):
     # Playwright
     browser_headless: bool = True
     browser_timeout: int = 15000
+    expand_timeout: int = 5000
+    wait_timeout: int = 5000
+    wait_quiet_ms: int = 150
+    browser_pool_size: int = 2
+    context_pool_size: int = 4
+    context_max_uses: int = 20
+    context_max_age: int = 600  # секунды
+
+    # Блокировка лишних запросов браузера (картинки, шрифты, счетчики)
+    block_requests: bool = True
+    # Стили не блокируем: без CSS у кнопок-иконок (пагинация, шевроны) пустые
+    # размеры, и Playwright ждет их видимости до таймаута
+    blocked_resource_types: List[str] = ["image", "media", "font"]
+    # Регулярные выражения для URL; allowed_url_patterns важнее запретов
+    blocked_url_patterns: List[str] = [
+        r"mc\.yandex\.ru",
+        r"google-analytics\.com",
+        r"googletagmanager\.com",
+        r"top-fwz1\.mail\.ru",
+        r"/counter",
+    ]
+    allowed_url_patterns: List[str] = []
+    # Примерный размер заблокированного ресурса по типу, байт
+    blocked_size_estimates: Dict[str, int] = {
+        "image": 30_000,
+        "media": 200_000,
+        "font": 60_000,
+        "stylesheet": 40_000,
+        "script": 50_000,
+        "other": 5_000,
+    }
+
+    # Запись трафика браузера в HAR и воспроизведение из него (без сети)
+    har_record_path: Optional[str] = None
+    har_replay_path: Optional[str] = None
+    replay_latency_ms: int = 0
+
+    # Разбор основной информации по снимку HTML вместо запросов к браузеру
+    snapshot_extraction: bool = False
+    # Раскрытие характеристик (truInfo_*, medInfo*) всех позиций одним скриптом
+    bulk_characteristics: bool = True
+    # Сколько вкладок параллельно обходят страницы позиций (1 - по очереди)
+    pagination_tabs: int = 3
+    # Часть URL запроса, подгружающего страницу позиций (пусто - любой XHR/fetch)
+    pagination_xhr_pattern: str = ""
+
+    # Учет вызовов Playwright по местам вызова (module:function) для каждого тендера
+    browser_call_tracking: bool = False
+    browser_call_report_top: int = 10
+
+    # HTTP-клиент для страниц, которые не требуют браузера
+    http_timeout: float = 15.0
+    http_max_connections: int = 20
+    documents_http_fast_path: bool = True
+    common_info_http_fast_path: bool = True
+
+    # Кэш результатов парсинга (0 - отключен)
+    cache_ttl: int = 3600  # секунды
+    cache_max_bytes: int = 64 * 1024 * 1024
+
+    # Пакетный парсинг: сколько тендеров парсится одновременно
+    batch_concurrency: int = 4
+
+    # Фоновые задачи парсинга
+    job_workers: int = 2
+    job_queue_size: int = 1000
+    job_ttl: int = 3600  # секунды хранения завершенных задач
 
     # Ключ доступа
     api_key: str = Field(...)
@@ -1,7 +1,13 @@
 import logging
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from app.api.router import router
+from app.services.job_service import job_service
+from app.utils.browser_pool import browser_pool
+from app.utils.http_client import http_client
 
 # Настройка логирования
 logging.basicConfig(
@@ -9,6 +15,20 @@ logging.basicConfig(
 )
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Запуск и остановка общих ресурсов приложения"""
+    await browser_pool.start()
+    await http_client.start()
+    await job_service.start()
+    try:
+        yield
+    finally:
+        await job_service.stop()
+        await http_client.stop()
+        await browser_pool.stop()
+
+
 # Создание приложения
 app = FastAPI(
     title="Tender Parser Microservice",
@@ -17,6 +37,13 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    lifespan=lifespan,
 )
 
-app.include_router(router, prefix="/api")
\ No newline at end of file
+app.include_router(router, prefix="/api")
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Метрики Prometheus: длительность и результаты этапов парсинга, ожидания"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
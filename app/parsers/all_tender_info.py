@@ -1,47 +1,197 @@
+import asyncio
 import logging
+from typing import AsyncIterator, Optional
 
+from app.core.settings import settings
+from app.parsers.parse_context import ParseContext
 from app.parsers.tender_feature_parsers.documents_info import get_tender_documents
 from app.parsers.tender_feature_parsers.general_requirements import (
     get_general_requirements,
 )
 from app.parsers.tender_feature_parsers.tender_info import get_tender_info
-from app.parsers.tender_feature_parsers.items_info import get_tender_items
+from app.parsers.tender_feature_parsers.items_info import iter_tender_items
+from app.schemas.stream import TenderStreamEvent
 from app.schemas.tender import TenderData
+from app.utils.browser_calls import track_browser_calls
 from app.utils.create_driver import get_page
+from app.utils.format_check import get_browser_requirement
+from app.utils.html_snapshot import HtmlSnapshot
+from app.utils.http_client import FastPathStats, http_client
+from app.utils.metrics import observe_iteration, observe_stage, track_stage
+from app.utils.tender_trace import start_trace
+from app.utils.waiting import track_waits
 
 logger = logging.getLogger(__name__)
 
+# Как часто для общей информации приходится откатываться на браузер
+common_info_fast_path = FastPathStats("common_info")
+
 
 async def get_tender(url: str) -> TenderData:
-    """Функция для получения всей информации о тендере"""
+    """Функция для получения всей информации о тендере
 
-    try:
-        async with get_page() as page:
-            await page.goto(url)
+    Сначала страница загружается обычным HTTP-запросом. Если разметки
+    достаточно, тендер разбирается без браузера; иначе (клики по позициям,
+    медицинская таблица, пагинация) используется браузер.
+    """
+    tender = {"items": []}
 
-            logger.debug("Парсинг основной информации")
-            tenderInfo = await get_tender_info(page)
+    async for event in iter_tender(url):
+        if event.event == "items":
+            tender["items"].extend(event.data)
+        else:
+            tender[event.event] = event.data
 
-            logger.debug("Парсинг позиций закупки")
-            items = await get_tender_items(page)
+    return TenderData(
+        tenderInfo=tender["tenderInfo"],
+        items=tender["items"],
+        generalRequirements=tender["generalRequirements"],
+        attachments=tender["attachments"],
+    )
 
-            generalRequirements = await get_general_requirements(page)
 
-        # Документы парсим отдельно
-        logger.debug("Парсинг документов")
-        attachments = await get_tender_documents(url)
+async def iter_tender(url: str) -> AsyncIterator[TenderStreamEvent]:
+    """Информация о тендере по частям, по мере разбора
 
-        logger.info(
-            f"Парсинг завершен. Позиций: {len(items)}, документов: {len(attachments)}"
-        )
+    Сначала основная информация, затем позиции по странице пагинации,
+    в конце общие требования и документы.
+    """
+
+    trace = start_trace()
+    waits = track_waits()
+    calls = track_browser_calls()
+    items_count = 0
+    attachments_count = 0
+
+    try:
+        snapshot = None
+        if settings.common_info_http_fast_path:
+            snapshot = await observe_stage(
+                "navigation_http", get_common_info_snapshot(url)
+            )
+
+        if snapshot is not None:
+            events = parse_tender_snapshot(url, snapshot)
+        else:
+            events = parse_tender_in_browser(url)
 
-        return TenderData(
-            tenderInfo=tenderInfo,
-            items=items,
-            generalRequirements=generalRequirements,
-            attachments=attachments,
+        async for event in events:
+            if event.event == "items":
+                items_count += len(event.data)
+            elif event.event == "attachments":
+                attachments_count = len(event.data)
+            yield event
+
+        logger.info(
+            f"Парсинг завершен. Позиций: {items_count}, документов: {attachments_count}"
         )
+        logger.info(f"Ожидания: {waits.summary()}")
+        trace.add_waits(waits)
+        trace.count("items", items_count)
+        trace.count("documents", attachments_count)
+        if calls is not None and calls.count:
+            trace.count("browserCalls", calls.count)
+            logger.info(
+                f"Вызовы браузера: {calls.summary(settings.browser_call_report_top)}"
+            )
 
     except Exception as e:
         logger.error(f"Ошибка при парсинге тендера: {e}", exc_info=True)
         raise
+
+
+async def get_common_info_snapshot(url: str) -> Optional[HtmlSnapshot]:
+    """Быстрый путь: страница общей информации без браузера
+
+    Возвращает None, если статического HTML для разбора недостаточно.
+    """
+    try:
+        html = await http_client.get_text(url)
+    except Exception as e:
+        common_info_fast_path.fallback(f"ошибка запроса: {e}")
+        return None
+
+    snapshot = HtmlSnapshot(html, url=url)
+    reason = await get_browser_requirement(snapshot)
+    if reason is not None:
+        common_info_fast_path.fallback(reason)
+        return None
+
+    common_info_fast_path.hit()
+    return snapshot
+
+
+async def parse_tender_snapshot(
+    url: str, snapshot: HtmlSnapshot
+) -> AsyncIterator[TenderStreamEvent]:
+    """Разбор тендера по HTML, полученному без браузера"""
+    logger.debug("Парсинг документов")
+    documents_task = asyncio.create_task(
+        observe_stage("documents", get_tender_documents(url))
+    )
+
+    try:
+        ctx = ParseContext(snapshot, expanded=True)
+
+        logger.debug("Парсинг основной информации (HTTP)")
+        yield TenderStreamEvent(
+            event="tenderInfo", data=await observe_stage("tender_info", get_tender_info(ctx))
+        )
+
+        logger.debug("Парсинг позиций закупки (HTTP)")
+        async for batch in observe_iteration("items", iter_tender_items(snapshot)):
+            yield TenderStreamEvent(event="items", data=batch)
+
+        yield TenderStreamEvent(
+            event="generalRequirements",
+            data=await observe_stage("general_requirements", get_general_requirements(ctx)),
+        )
+
+        yield TenderStreamEvent(event="attachments", data=await documents_task)
+    finally:
+        if not documents_task.done():
+            documents_task.cancel()
+            await asyncio.gather(documents_task, return_exceptions=True)
+
+
+async def parse_tender_in_browser(url: str) -> AsyncIterator[TenderStreamEvent]:
+    """Разбор тендера на живой странице браузера"""
+    async with get_page() as page:
+        # Документы парсим параллельно во второй вкладке того же контекста
+        logger.debug("Парсинг документов")
+        documents_task = asyncio.create_task(
+            observe_stage("documents", get_tender_documents(url, context=page.context))
+        )
+
+        try:
+            async with track_stage("navigation"):
+                await page.goto(url)
+
+            ctx = ParseContext(page)
+            if settings.snapshot_extraction:
+                # Раскрываем блоки один раз и дальше разбираем HTML без браузера
+                ctx = await ctx.snapshot()
+
+            logger.debug("Парсинг основной информации")
+            yield TenderStreamEvent(
+                event="tenderInfo",
+                data=await observe_stage("tender_info", get_tender_info(ctx)),
+            )
+
+            # Позиции требуют кликов и пагинации - разбираем на живой странице
+            logger.debug("Парсинг позиций закупки")
+            async for batch in observe_iteration("items", iter_tender_items(page)):
+                yield TenderStreamEvent(event="items", data=batch)
+
+            yield TenderStreamEvent(
+                event="generalRequirements",
+                data=await observe_stage(
+                    "general_requirements", get_general_requirements(ctx)
+                ),
+            )
+
+            yield TenderStreamEvent(event="attachments", data=await documents_task)
+        finally:
+            if not documents_task.done():
+                documents_task.cancel()
+                await asyncio.gather(documents_task, return_exceptions=True)
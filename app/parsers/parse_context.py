@@ -0,0 +1,54 @@
+from typing import Optional
+
+from playwright.async_api import Page
+
+from app.utils.expand_elements import expand_collapse_blocks
+from app.utils.format_check import is_paste_format
+from app.utils.html_snapshot import HtmlSnapshot
+from app.utils.section_index import SectionIndex
+
+
+class ParseContext:
+    """Общее состояние разбора одной страницы тендера
+
+    Формат страницы, раскрытие блоков и индекс секций вычисляются один раз
+    и переиспользуются всеми парсерами.
+    """
+
+    def __init__(
+        self, page: Page, is_paste: Optional[bool] = None, expanded: bool = False
+    ):
+        self.page = page
+        self._is_paste = is_paste
+        self._expanded = expanded
+        self._section_index: Optional[SectionIndex] = None
+
+    async def is_paste_format(self) -> bool:
+        """Формат страницы (paste или html_content), определяется один раз"""
+        if self._is_paste is None:
+            self._is_paste = await is_paste_format(self.page)
+        return self._is_paste
+
+    async def expand_collapse_blocks(self):
+        """Раскрытие свернутых блоков, выполняется один раз на страницу"""
+        if self._expanded:
+            return
+
+        await expand_collapse_blocks(self.page)
+        self._expanded = True
+        # Индекс, построенный до раскрытия, мог не видеть содержимое блоков
+        self._section_index = None
+
+    async def section_index(self) -> SectionIndex:
+        """Индекс секций, строится при первом обращении"""
+        if self._section_index is None:
+            self._section_index = await SectionIndex.build(self.page)
+        return self._section_index
+
+    async def snapshot(self) -> "ParseContext":
+        """Контекст для разбора снимка HTML с уже раскрытыми блоками"""
+        if await self.is_paste_format():
+            await self.expand_collapse_blocks()
+
+        snapshot = await HtmlSnapshot.from_page(self.page)
+        return ParseContext(snapshot, is_paste=self._is_paste, expanded=True)
@@ -2,51 +2,30 @@ import logging
 import re
 from typing import Optional
 
-from playwright.async_api import Page
-
-from app.utils.format_check import is_paste_format
-from app.utils.expand_elements import expand_collapse_blocks
+from app.parsers.parse_context import ParseContext
 
 logger = logging.getLogger(__name__)
 
 
-async def get_delivery_address(page: Page) -> Optional[str]:
+async def get_delivery_address(ctx: ParseContext) -> Optional[str]:
     """Главная функция для извлечения адреса доставки"""
     logger.info("Начало извлечения адреса доставки")
 
-    if await is_paste_format(page):
-        return await parse_delivery_address_paste(page)
+    if await ctx.is_paste_format():
+        return await parse_delivery_address_paste(ctx)
     else:
-        return await parse_delivery_address_html(page)
+        return await parse_delivery_address_html(ctx)
 
 
-async def parse_delivery_address_paste(page: Page) -> Optional[str]:
+async def parse_delivery_address_paste(ctx: ParseContext) -> Optional[str]:
     """Извлечение адреса доставки для формата paste"""
     logger.debug("Используется парсер для формата paste")
-    await expand_collapse_blocks(page)
+    await ctx.expand_collapse_blocks()
 
     try:
-        sections = await page.query_selector_all(
-            "div.collapse__content section.blockInfo__section.section"
-        )
-
-        logger.debug(f"Найдено {len(sections)} секций в collapse блоках")
-
-        for section in sections:
-            try:
-                title = await section.query_selector("span.section__title")
-                if title:
-                    title_text = await title.text_content()
-                    if "Место поставки товара" in title_text:
-                        info = await section.query_selector("span.section__info")
-                        if info:
-                            address = await info.text_content()
-                            address = re.sub(r"\s+", " ", address.strip())
-                            logger.info(f"Найден адрес доставки: {address[:50]}...")
-                            return address
-            except Exception as e:
-                logger.debug(f"Ошибка при обработке секции: {e}")
-                continue
+        address = await find_delivery_address(ctx, collapsed_only=True)
+        if address:
+            return address
 
         logger.warning("Адрес доставки не найден в формате paste")
 
@@ -56,29 +35,14 @@ async def parse_delivery_address_paste(page: Page) -> Optional[str]:
     return None
 
 
-async def parse_delivery_address_html(page: Page) -> Optional[str]:
+async def parse_delivery_address_html(ctx: ParseContext) -> Optional[str]:
     """Извлечение адреса доставки для формата html_content"""
     logger.debug("Используется парсер для формата html_content")
 
     try:
-        sections = await page.query_selector_all("section.blockInfo__section.section")
-        logger.debug(f"Найдено {len(sections)} секций")
-
-        for section in sections:
-            try:
-                title = await section.query_selector("span.section__title")
-                if title:
-                    title_text = await title.text_content()
-                    if "Место поставки товара" in title_text:
-                        info = await section.query_selector("span.section__info")
-                        if info:
-                            address = await info.text_content()
-                            address = re.sub(r"\s+", " ", address.strip())
-                            logger.info(f"Найден адрес доставки: {address[:50]}...")
-                            return address
-            except Exception as e:
-                logger.debug(f"Ошибка при обработке секции: {e}")
-                continue
+        address = await find_delivery_address(ctx, collapsed_only=False)
+        if address:
+            return address
 
         logger.warning("Адрес доставки не найден в формате html_content")
 
@@ -86,3 +50,17 @@ async def parse_delivery_address_html(page: Page) -> Optional[str]:
         logger.error(f"Ошибка при парсинге адреса (html): {e}")
 
     return None
+
+
+async def find_delivery_address(
+    ctx: ParseContext, collapsed_only: bool
+) -> Optional[str]:
+    """Поиск секции 'Место поставки товара' в индексе секций"""
+    index = await ctx.section_index()
+    address = index.info("Место поставки товара", collapsed_only=collapsed_only)
+    if address is None:
+        return None
+
+    address = re.sub(r"\s+", " ", address.strip())
+    logger.info(f"Найден адрес доставки: {address[:50]}...")
+    return address
@@ -1,123 +1,35 @@
 import logging
 import re
-from typing import Optional
+from typing import List, Optional
 
-from playwright.async_api import Page
-
-from app.utils.expand_elements import expand_collapse_blocks
-from app.utils.format_check import is_paste_format
+from app.parsers.parse_context import ParseContext
+from app.utils.section_index import Section
 
 logger = logging.getLogger(__name__)
 
 
-async def get_delivery_conditions(page: Page) -> Optional[str]:
+async def get_delivery_conditions(ctx: ParseContext) -> Optional[str]:
     """Главная функция для извлечения условий доставки"""
     logger.info("Начало извлечения условий доставки")
 
-    if await is_paste_format(page):
-        return await parse_delivery_conditions_paste(page)
+    if await ctx.is_paste_format():
+        return await parse_delivery_conditions_paste(ctx)
     else:
-        return await parse_delivery_conditions_html(page)
+        return await parse_delivery_conditions_html(ctx)
 
 
-async def parse_delivery_conditions_paste(page: Page) -> Optional[str]:
+async def parse_delivery_conditions_paste(ctx: ParseContext) -> Optional[str]:
     """Извлечение условий доставки для формата paste"""
     logger.debug("Используется парсер для формата paste")
 
-    conditions = []
-    await expand_collapse_blocks(page)
+    await ctx.expand_collapse_blocks()
 
     try:
-        sections = await page.query_selector_all(
-            "div.collapse__content section.blockInfo__section"
+        index = await ctx.section_index()
+        conditions = collect_delivery_conditions(
+            index.sections(collapsed_only=True), first_only=True
         )
 
-        # 1. Проверяем информацию о сроке исполнения
-        for section in sections:
-            try:
-                info_spans = await section.query_selector_all("span.section__info")
-                for info in info_spans:
-                    text = await info.text_content()
-                    if "включает в том числе приемку" in text:
-                        conditions.append(
-                            "Срок исполнения включает приемку и оплату товара"
-                        )
-                        break
-            except:
-                continue
-
-        # 2. Односторонний отказ
-        for section in sections:
-            try:
-                title = await section.query_selector("span.section__title")
-                if title:
-                    title_text = await title.text_content()
-                    if (
-                        "односторонн" in title_text.lower()
-                        and "отказ" in title_text.lower()
-                    ):
-                        info = await section.query_selector("span.section__info")
-                        if info:
-                            info_text = await info.text_content()
-                            if "да" in info_text.lower():
-                                conditions.append(
-                                    "Предусмотрена возможность одностороннего отказа от исполнения контракта"
-                                )
-                                break
-            except:
-                continue
-
-        # 3. Обеспечение исполнения контракта
-        for i, section in enumerate(sections):
-            try:
-                title = await section.query_selector("span.section__title")
-                if title:
-                    title_text = await title.text_content()
-                    if "Требуется обеспечение исполнения контракта" in title_text:
-                        info = await section.query_selector("span.section__info")
-                        if info:
-                            info_text = await info.text_content()
-                            if "да" in info_text.lower():
-                                # Ищем размер обеспечения
-                                for j in range(i + 1, min(i + 3, len(sections))):
-                                    try:
-                                        next_title = await sections[j].query_selector(
-                                            "span.section__title"
-                                        )
-                                        if next_title:
-                                            next_title_text = (
-                                                await next_title.text_content()
-                                            )
-                                            if (
-                                                "Размер обеспечения исполнения контракта"
-                                                in next_title_text
-                                            ):
-                                                size_info = await sections[
-                                                    j
-                                                ].query_selector("span.section__info")
-                                                if size_info:
-                                                    size_text = (
-                                                        await size_info.text_content()
-                                                    )
-                                                    percent_match = re.search(
-                                                        r"(\d+(?:[,.]\d+)?)\s*%",
-                                                        size_text,
-                                                    )
-                                                    if percent_match:
-                                                        conditions.append(
-                                                            f"Требуется обеспечение исполнения контракта: {percent_match.group(1)} %"
-                                                        )
-                                                    else:
-                                                        conditions.append(
-                                                            "Требуется обеспечение исполнения контракта"
-                                                        )
-                                                    break
-                                    except:
-                                        continue
-                                break
-            except:
-                continue
-
         if conditions:
             result = "; ".join(conditions)
             logger.info(f"Найдены условия доставки: {len(conditions)} условий")
@@ -129,99 +41,13 @@ async def parse_delivery_conditions_paste(page: Page) -> Optional[str]:
     return None
 
 
-async def parse_delivery_conditions_html(page: Page) -> Optional[str]:
+async def parse_delivery_conditions_html(ctx: ParseContext) -> Optional[str]:
     """Извлечение условий доставки для формата html_content"""
     logger.debug("Используется парсер для формата html_content")
 
-    conditions = []
-
     try:
-        sections = await page.query_selector_all("section.blockInfo__section")
-
-        # 1. Проверяем информацию о сроке исполнения
-        for section in sections:
-            try:
-                info_spans = await section.query_selector_all("span.section__info")
-                for info in info_spans:
-                    text = await info.text_content()
-                    if "включает в том числе приемку" in text:
-                        conditions.append(
-                            "Срок исполнения включает приемку и оплату товара"
-                        )
-                        break
-            except:
-                continue
-
-        # 2. Односторонний отказ
-        for section in sections:
-            try:
-                title = await section.query_selector("span.section__title")
-                if title:
-                    title_text = await title.text_content()
-                    if (
-                        "односторонн" in title_text.lower()
-                        and "отказ" in title_text.lower()
-                    ):
-                        info = await section.query_selector("span.section__info")
-                        if info:
-                            info_text = await info.text_content()
-                            if "да" in info_text.lower():
-                                conditions.append(
-                                    "Предусмотрена возможность одностороннего отказа от исполнения контракта"
-                                )
-            except:
-                continue
-
-        # 3. Обеспечение исполнения контракта
-        all_sections = await page.query_selector_all("section.blockInfo__section")
-        for i, section in enumerate(all_sections):
-            try:
-                title = await section.query_selector("span.section__title")
-                if title:
-                    title_text = await title.text_content()
-                    if "Требуется обеспечение исполнения контракта" in title_text:
-                        info = await section.query_selector("span.section__info")
-                        if info:
-                            info_text = await info.text_content()
-                            if "да" in info_text.lower():
-                                # Ищем размер
-                                for j in range(i + 1, min(i + 3, len(all_sections))):
-                                    try:
-                                        next_title = await all_sections[
-                                            j
-                                        ].query_selector("span.section__title")
-                                        if next_title:
-                                            next_title_text = (
-                                                await next_title.text_content()
-                                            )
-                                            if (
-                                                "Размер обеспечения исполнения контракта"
-                                                in next_title_text
-                                            ):
-                                                size_info = await all_sections[
-                                                    j
-                                                ].query_selector("span.section__info")
-                                                if size_info:
-                                                    size_text = (
-                                                        await size_info.text_content()
-                                                    )
-                                                    percent_match = re.search(
-                                                        r"(\d+(?:[,.]\d+)?)\s*%",
-                                                        size_text,
-                                                    )
-                                                    if percent_match:
-                                                        conditions.append(
-                                                            f"Требуется обеспечение исполнения контракта: {percent_match.group(1)} %"
-                                                        )
-                                                    else:
-                                                        conditions.append(
-                                                            "Требуется обеспечение исполнения контракта"
-                                                        )
-                                                    break
-                                    except:
-                                        continue
-            except:
-                continue
+        index = await ctx.section_index()
+        conditions = collect_delivery_conditions(index.sections(), first_only=False)
 
         if conditions:
             result = "; ".join(conditions)
@@ -232,3 +58,53 @@ async def parse_delivery_conditions_html(page: Page) -> Optional[str]:
         logger.error(f"Ошибка при парсинге условий (html): {e}")
 
     return None
+
+
+def collect_delivery_conditions(
+    sections: List[Section], first_only: bool
+) -> List[str]:
+    """Собирает условия доставки по секциям в порядке документа"""
+    conditions = []
+
+    # 1. Проверяем информацию о сроке исполнения
+    for section in sections:
+        if any("включает в том числе приемку" in info for info in section.infos):
+            conditions.append("Срок исполнения включает приемку и оплату товара")
+
+    # 2. Односторонний отказ
+    for section in sections:
+        if "односторонн" in section.key and "отказ" in section.key:
+            if section.info is not None and "да" in section.info.lower():
+                conditions.append(
+                    "Предусмотрена возможность одностороннего отказа от исполнения контракта"
+                )
+                if first_only:
+                    break
+
+    # 3. Обеспечение исполнения контракта
+    for i, section in enumerate(sections):
+        if "требуется обеспечение исполнения контракта" not in section.key:
+            continue
+        if section.info is None:
+            continue
+        if "да" in section.info.lower():
+            # Ищем размер обеспечения в следующих секциях
+            for next_section in sections[i + 1 : i + 3]:
+                if "размер обеспечения исполнения контракта" in next_section.key:
+                    if next_section.info is not None:
+                        percent_match = re.search(
+                            r"(\d+(?:[,.]\d+)?)\s*%", next_section.info
+                        )
+                        if percent_match:
+                            conditions.append(
+                                f"Требуется обеспечение исполнения контракта: {percent_match.group(1)} %"
+                            )
+                        else:
+                            conditions.append(
+                                "Требуется обеспечение исполнения контракта"
+                            )
+                        break
+            if first_only:
+                break
+
+    return conditions
@@ -1,5 +1,4 @@
-from playwright.async_api import Page
-
+from app.parsers.parse_context import ParseContext
 from app.parsers.tender_feature_parsers.delivery_features.address import (
     get_delivery_address,
 )
@@ -10,11 +9,11 @@ from app.parsers.tender_feature_parsers.delivery_features.term import get_delive
 from app.schemas.general import DeliveryInfo
 
 
-async def get_delivery_info(page: Page) -> DeliveryInfo:
+async def get_delivery_info(ctx: ParseContext) -> DeliveryInfo:
     """Основная функция для получения информации о доставке"""
-    deliveryAddress = await get_delivery_address(page)
-    deliveryTerm = await get_delivery_term(page)
-    deliveryConditions = await get_delivery_conditions(page)
+    deliveryAddress = await get_delivery_address(ctx)
+    deliveryTerm = await get_delivery_term(ctx)
+    deliveryConditions = await get_delivery_conditions(ctx)
 
     return DeliveryInfo(
         deliveryAddress=deliveryAddress,
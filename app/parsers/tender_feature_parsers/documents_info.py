@@ -1,16 +1,28 @@
 import re
 import logging
-from typing import List
+from typing import List, Optional
 
+from playwright.async_api import BrowserContext, Page
 
+from app.core.settings import settings
 from app.schemas.attachments import Attachment
+from app.utils.browser_calls import track_page
+from app.utils.browser_pool import create_page
 from app.utils.create_driver import get_page
 from app.utils.expand_elements import expand_all_documents
 from app.utils.format_check import get_file_type
+from app.utils.html_snapshot import HtmlSnapshot
+from app.utils.http_client import FastPathStats, http_client
 from app.utils.validator import extract_reg_number
 
 logger = logging.getLogger(__name__)
 
+# Как часто для документов приходится откатываться на браузер
+documents_fast_path = FastPathStats("documents")
+
+# Тексты ссылок, раскрывающих скрытые документы (как в EXPAND_DOCUMENTS_SCRIPT)
+SHOW_MORE_LABELS = ("показать больше", "показать все")
+
 
 def get_documents_url(tender_url: str) -> str:
     """Преобразует URL общей информации в URL документов"""
@@ -18,92 +30,166 @@ def get_documents_url(tender_url: str) -> str:
     return f"https://zakupki.gov.ru/epz/order/notice/ea20/view/documents.html?regNumber={reg_number}"
 
 
-async def get_tender_documents(tender_url: str) -> List[Attachment]:
-    """Основная функция для парсинга документов"""
-    documents = []
+async def get_tender_documents(
+    tender_url: str, context: BrowserContext = None
+) -> List[Attachment]:
+    """Основная функция для парсинга документов
+
+    Сначала страница документов загружается обычным HTTP-запросом. Браузер
+    нужен, только если в ответе нет ожидаемой разметки: тогда документы
+    открываются во вкладке переданного контекста (с общими cookies), либо на
+    отдельной странице из пула.
+    """
     documents_url = get_documents_url(tender_url)
 
     logger.info(f"Начало парсинга документов: {tender_url}")
 
-    try:
-        async with get_page() as page:
-            await page.goto(documents_url)
-            logger.debug("Страница документов загружена")
+    if settings.documents_http_fast_path:
+        documents = await get_documents_via_http(documents_url)
+        if documents is not None:
+            logger.info(f"Парсинг документов завершен (HTTP). Найдено: {len(documents)}")
+            return documents
 
-            # Ждем загрузки блока
+    documents = []
+    try:
+        if context is not None:
+            page = track_page(await create_page(context))
             try:
-                await page.wait_for_selector(".blockFilesTabDocs", timeout=10000)
-                logger.debug("Блок с документами найден")
-            except:
-                logger.warning("Блок с документами не найден")
-                return documents
-
-            # Раскрываем скрытые документы
-            await expand_all_documents(page)
-
-            # Находим только блок с прикрепленными файлами (не из внешних систем)
-            attached_files_block = None
-            blocks = await page.query_selector_all(".blockFilesTabDocs")
-
-            for block in blocks:
-                # Проверяем заголовок блока
-                title_elem = await block.query_selector(".section__title")
-                if title_elem:
-                    title_text = await title_elem.text_content()
-                    if "Прикрепленные файлы" in title_text:
-                        attached_files_block = block
-                        logger.debug("Найден блок 'Прикрепленные файлы'")
-                        break
-
-            if not attached_files_block:
-                logger.warning("Блок 'Прикрепленные файлы' не найден")
-                return documents
-
-            # Находим документы только в этом блоке
-            doc_rows = await attached_files_block.query_selector_all(".attachment.row")
-
-            for idx, row in enumerate(doc_rows):
-                try:
-                    # Ищем ссылку
-                    link = await row.query_selector("a[href*='filestore']")
-                    if not link:
-                        continue
-
-                    url = await link.get_attribute("href")
-                    if not url:
-                        logger.warning(f"Пустой URL для документа #{idx + 1}")
-                        continue
-
-                    # Получаем название
-                    name = await link.text_content()
-                    if not name:
-                        title = await link.get_attribute("title")
-                        if title:
-                            name = re.sub(r"\.\w+$", "", title)
-                        else:
-                            name = f"Документ #{idx + 1}"
-
-                    # Определяем тип
-                    file_type = "document"
-                    try:
-                        icon = await row.query_selector("img[src*='/icons/type/']")
-                        if icon:
-                            icon_src = await icon.get_attribute("src")
-                            file_type = get_file_type(icon_src)
-                    except:
-                        pass
-
-                    doc = Attachment(
-                        name=name.strip(), type=file_type, url=url, description=None
-                    )
-                    documents.append(doc)
-                    logger.debug(f"Документ #{idx + 1} обработан: {name}")
-
-                except Exception as e:
-                    logger.error(f"Ошибка при парсинге документа #{idx + 1}: {e}")
+                documents = await parse_documents_page(page, documents_url)
+            finally:
+                await page.close()
+        else:
+            async with get_page() as page:
+                documents = await parse_documents_page(page, documents_url)
 
     except Exception as e:
         logger.error(f"Критическая ошибка при парсинге документов: {e}", exc_info=True)
 
     logger.info(f"Парсинг документов завершен. Найдено: {len(documents)}")
     return documents
+
+
+async def get_documents_via_http(documents_url: str) -> Optional[List[Attachment]]:
+    """Быстрый путь: документы из HTML, полученного без браузера
+
+    Возвращает None, если разметки со списком файлов в ответе нет.
+    """
+    try:
+        html = await http_client.get_text(documents_url)
+    except Exception as e:
+        documents_fast_path.fallback(f"ошибка запроса: {e}")
+        return None
+
+    snapshot = HtmlSnapshot(html, url=documents_url)
+    documents = await extract_attachments(snapshot)
+    if documents is None:
+        documents_fast_path.fallback("нет блока 'Прикрепленные файлы'")
+        return None
+
+    # Часть документов подгружается по ссылке "Показать больше/все" -
+    # в статическом HTML список неполный
+    if await has_hidden_documents(snapshot):
+        documents_fast_path.fallback("есть ссылка 'Показать больше'")
+        return None
+
+    documents_fast_path.hit()
+    return documents
+
+
+async def has_hidden_documents(page: Page) -> bool:
+    """Есть ли в блоках документов ссылка 'Показать больше' или 'Показать все'"""
+    for link in await page.query_selector_all(".blockFilesTabDocs a"):
+        text = (await link.text_content() or "").strip().lower()
+        if any(label in text for label in SHOW_MORE_LABELS):
+            return True
+    return False
+
+
+async def parse_documents_page(page: Page, documents_url: str) -> List[Attachment]:
+    """Парсинг списка прикрепленных файлов со страницы документов в браузере"""
+    await page.goto(documents_url)
+    logger.debug("Страница документов загружена")
+
+    # Ждем загрузки блока
+    try:
+        await page.wait_for_selector(".blockFilesTabDocs", timeout=10000)
+        logger.debug("Блок с документами найден")
+    except:
+        logger.warning("Блок с документами не найден")
+        return []
+
+    # Раскрываем скрытые документы
+    await expand_all_documents(page)
+
+    return await extract_attachments(page) or []
+
+
+async def extract_attachments(page: Page) -> Optional[List[Attachment]]:
+    """Извлекает прикрепленные файлы со страницы или снимка HTML
+
+    Возвращает None, если блок 'Прикрепленные файлы' не найден.
+    """
+    documents = []
+
+    # Находим только блок с прикрепленными файлами (не из внешних систем)
+    attached_files_block = None
+    blocks = await page.query_selector_all(".blockFilesTabDocs")
+
+    for block in blocks:
+        # Проверяем заголовок блока
+        title_elem = await block.query_selector(".section__title")
+        if title_elem:
+            title_text = await title_elem.text_content()
+            if "Прикрепленные файлы" in title_text:
+                attached_files_block = block
+                logger.debug("Найден блок 'Прикрепленные файлы'")
+                break
+
+    if not attached_files_block:
+        logger.warning("Блок 'Прикрепленные файлы' не найден")
+        return None
+
+    # Находим документы только в этом блоке
+    doc_rows = await attached_files_block.query_selector_all(".attachment.row")
+
+    for idx, row in enumerate(doc_rows):
+        try:
+            # Ищем ссылку
+            link = await row.query_selector("a[href*='filestore']")
+            if not link:
+                continue
+
+            url = await link.get_attribute("href")
+            if not url:
+                logger.warning(f"Пустой URL для документа #{idx + 1}")
+                continue
+
+            # Получаем название
+            name = await link.text_content()
+            if not name:
+                title = await link.get_attribute("title")
+                if title:
+                    name = re.sub(r"\.\w+$", "", title)
+                else:
+                    name = f"Документ #{idx + 1}"
+
+            # Определяем тип
+            file_type = "document"
+            try:
+                icon = await row.query_selector("img[src*='/icons/type/']")
+                if icon:
+                    icon_src = await icon.get_attribute("src")
+                    file_type = get_file_type(icon_src)
+            except:
+                pass
+
+            doc = Attachment(
+                name=name.strip(), type=file_type, url=url, description=None
+            )
+            documents.append(doc)
+            logger.debug(f"Документ #{idx + 1} обработан: {name}")
+
+        except Exception as e:
+            logger.error(f"Ошибка при парсинге документа #{idx + 1}: {e}")
+
+    return documents
@@ -1,4 +1,3 @@
-import asyncio
 import logging
 import re
 from typing import Optional
@@ -15,7 +14,9 @@ from app.parsers.tender_feature_parsers.items_features.common.codes import (
 from app.parsers.tender_feature_parsers.items_features.common.price import parse_price
 from app.parsers.tender_feature_parsers.items_features.common.quantity import parse_quantity
 from app.schemas.items import Item, ItemCharacteristic
+from app.utils.html_snapshot import HtmlSnapshot
 from app.utils.validator import clean_text
+from app.utils.waiting import wait_for_selector
 
 logger = logging.getLogger(__name__)
 
@@ -102,18 +103,9 @@ async def parse_item_from_row(page: Page, row, item_id: int) -> Optional[Item]:
                     if match:
                         info_id = match.group(1)
 
-                        try:
-                            # Кликаем для разворачивания
-                            await chevron.click()
-                            await asyncio.sleep(1)
-                        except Exception as e:
-                            logger.debug(f"Не удалось кликнуть на chevron: {e}")
-                            # Альтернативный способ через JavaScript
-                            try:
-                                await page.evaluate(onclick_attr)
-                                await asyncio.sleep(1)
-                            except:
-                                logger.debug("Не удалось раскрыть характеристики через JS")
+                        # В снимке HTML характеристики уже в разметке
+                        if not isinstance(page, HtmlSnapshot):
+                            await expand_characteristics(page, chevron, onclick_attr, info_id)
 
                         # Находим таблицу с характеристиками
                         info_rows = await page.query_selector_all(
@@ -160,4 +152,27 @@ async def parse_item_from_row(page: Page, row, item_id: int) -> Optional[Item]:
 
     except Exception as e:
         logger.error(f"Ошибка при парсинге товара: {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+async def expand_characteristics(page: Page, chevron, onclick_attr: str, info_id: str):
+    """Раскрывает строки truInfo_* с характеристиками товара"""
+    # Уже раскрытую строку (например, массовым раскрытием) повторный клик свернет
+    if await page.query_selector(f"tr.truInfo_{info_id} table.tableBlock"):
+        return
+
+    try:
+        # Кликаем для разворачивания
+        await chevron.click()
+    except Exception as e:
+        logger.debug(f"Не удалось кликнуть на chevron: {e}")
+        # Альтернативный способ через JavaScript
+        try:
+            await page.evaluate(onclick_attr)
+        except:
+            logger.debug("Не удалось раскрыть характеристики через JS")
+
+    # Строка появляется раньше, чем по AJAX приходит таблица - ждем таблицу
+    await wait_for_selector(
+        page, f"tr.truInfo_{info_id} table.tableBlock", label="characteristics"
+    )
\ No newline at end of file
@@ -5,6 +5,8 @@ from typing import Dict, List, Optional
 from playwright.async_api import Page
 
 from app.schemas.items import ItemCharacteristic
+from app.utils.html_snapshot import HtmlSnapshot
+from app.utils.waiting import wait_for_selector
 
 logger = logging.getLogger(__name__)
 
@@ -31,11 +33,6 @@ async def parse_codes_and_alternatives(
                 'characteristics': updated_characteristics
             }
 
-        # Закрываем модальное окно если есть
-        modal = await page.query_selector(".popupModalOverlay")
-        if modal:
-            await page.evaluate("document.querySelector('.popupModalOverlay')?.remove()")
-
         # Получаем ID информационного блока
         onclick = await arrow.get_attribute("onclick")
         info_id = None
@@ -44,8 +41,9 @@ async def parse_codes_and_alternatives(
             if match:
                 info_id = match.group(1)
 
-        await arrow.click()
-        await page.wait_for_timeout(500)
+        # В снимке HTML строки уже раскрыты
+        if not isinstance(page, HtmlSnapshot):
+            await expand_medicine_row(page, arrow, info_id)
 
         if not info_id:
             return {
@@ -82,6 +80,24 @@ async def parse_codes_and_alternatives(
     }
 
 
+async def expand_medicine_row(page: Page, arrow, info_id: Optional[str]):
+    """Раскрывает строку medInfo* с вариантами поставки"""
+    # Уже раскрытую строку (например, массовым раскрытием) повторный клик свернет
+    if info_id and await page.query_selector(f"tr.{info_id}"):
+        return
+
+    # Закрываем модальное окно если есть
+    modal = await page.query_selector(".popupModalOverlay")
+    if modal:
+        await page.evaluate("document.querySelector('.popupModalOverlay')?.remove()")
+
+    await arrow.click()
+
+    if info_id:
+        # Ждем появления развернутых строк
+        await wait_for_selector(page, f"tr.{info_id}", label="medicine_info")
+
+
 async def parse_variant_table(variant_table, unit: str, characteristics: List[ItemCharacteristic],
                               form: str = None) -> Dict:
     """Парсит таблицу с вариантами поставки"""
@@ -1,19 +1,42 @@
+import asyncio
 import logging
-from typing import List
+import math
+from typing import AsyncIterator, Dict, List, Optional
 
-from playwright.async_api import Page
+from playwright.async_api import BrowserContext, Page
 
 from app.parsers.tender_feature_parsers.items_features.common.item import parse_item_from_row
 from app.parsers.tender_feature_parsers.items_features.medicine.medical_item import parse_medical_item_from_row
+from app.core.settings import settings
 from app.schemas.items import Item
-from app.utils.pagination_button import go_to_next_page
+from app.utils.browser_calls import track_page
+from app.utils.browser_pool import create_page
+from app.utils.metrics import PAGINATION_PAGES
+from app.utils.tender_trace import current_trace
+from app.utils.expand_elements import expand_item_characteristics, expand_medicine_info
+from app.utils.pagination_button import get_page_count, go_to_next_page, go_to_page
+from app.utils.waiting import wait_for_selector
 
 logger = logging.getLogger(__name__)
 
+ITEMS_TABLE_SELECTOR = "#positionKTRU table.tableBlock"
+
+# Сколько медицинских позиций отдавать за раз при потоковом парсинге
+MEDICAL_BATCH_SIZE = 20
+
 
 async def get_tender_items(page: Page) -> List[Item]:
     """Основная функция для парсинга товаров тендера"""
     items = []
+    async for batch in iter_tender_items(page):
+        items.extend(batch)
+
+    logger.info(f"Всего найдено товаров: {len(items)}")
+    return items
+
+
+async def iter_tender_items(page: Page) -> AsyncIterator[List[Item]]:
+    """Парсинг товаров тендера порциями: по странице пагинации за раз"""
 
     # Проверяем наличие медицинской таблицы ВНУТРИ любого контейнера
     med_table = await page.query_selector("[id^='medTable']")
@@ -22,6 +45,13 @@ async def get_tender_items(page: Page) -> List[Item]:
         # Медицинские товары
         logger.info("Парсинг медицинских товаров")
 
+        # Все строки medInfo* раскрываем разом и разбираем снимок таблицы
+        source = page
+        if settings.bulk_characteristics:
+            source = await expand_medicine_info(page) or page
+            med_table = await source.query_selector("[id^='medTable']") or med_table
+
+        batch = []
         try:
             # Находим таблицу внутри медицинского блока
             table = await med_table.query_selector("table.tableBlock")
@@ -35,76 +65,236 @@ async def get_tender_items(page: Page) -> List[Item]:
 
                 item_id = 1
                 for row in item_rows:
-                    item = await parse_medical_item_from_row(page, row, item_id)
+                    item = await parse_medical_item_from_row(source, row, item_id)
                     if item:
-                        items.append(item)
+                        batch.append(item)
                         item_id += 1
 
+                    if len(batch) >= MEDICAL_BATCH_SIZE:
+                        yield batch
+                        batch = []
+
+                if batch:
+                    yield batch
+
         except Exception as e:
             logger.error(f"Ошибка при парсинге медицинских товаров: {e}")
+            # Отдаем то, что успели распарсить
+            if batch:
+                yield batch
 
     else:
         # Обычные товары - проверяем есть ли вообще таблица
-        regular_table = await page.query_selector("#positionKTRU table.tableBlock")
+        regular_table = await page.query_selector(ITEMS_TABLE_SELECTOR)
 
         if regular_table:
             logger.info("Парсинг обычных товаров")
 
-            try:
-                item_id = 1
-                page_num = 1
+            page_count = await get_page_count(page)
+            if page_count > 1 and settings.pagination_tabs > 1:
+                logger.info(f"Страниц позиций: {page_count}, парсим параллельно")
+                pages = iter_pages_parallel(page, page_count)
+            else:
+                pages = iter_pages_sequential(page)
+
+            # Страницы считает parse_items_page, включая пустые и дочитанные
+            # после последней видимой в пагинаторе
+            trace = current_trace()
+            pages_before = trace.counts.get("pages", 0) if trace is not None else 0
+
+            # Номера позиций сквозные в порядке страниц
+            item_id = 1
+            async for batch in pages:
+                for item in batch:
+                    item.id = item_id
+                    item_id += 1
+                yield batch
+
+            if trace is not None:
+                PAGINATION_PAGES.observe(trace.counts.get("pages", 0) - pages_before)
 
-                while True:
-                    logger.info(f"Парсинг страницы {page_num}...")
 
-                    # Заново находим таблицу после каждого перехода страницы
-                    current_table = await page.query_selector("#positionKTRU table.tableBlock")
-                    if not current_table:
-                        logger.error("Таблица не найдена после перехода на страницу")
-                        break
+async def iter_pages_sequential(page: Page) -> AsyncIterator[List[Item]]:
+    """Позиции по страницам пагинации в одной вкладке"""
+    try:
+        page_num = 1
 
-                    # Находим строки товаров на текущей странице
-                    item_rows = await current_table.query_selector_all(
-                        "tbody.tableBlock__body > tr.tableBlock__row"
-                    )
+        while True:
+            batch = await parse_items_page(page, page_num)
+            if batch is None:
+                break
+            if batch:
+                yield batch
 
-                    logger.info(f"Найдено {len(item_rows)} строк на странице {page_num}")
+            # Пагинация
+            if not await go_to_next_page(page):
+                logger.info("Достигнута последняя страница")
+                break
 
-                    # Парсим товары с текущей страницы
-                    parsed_on_page = 0
-                    for row in item_rows:
-                        # Пропускаем информационные строки
-                        class_name = await row.get_attribute("class")
-                        if class_name and "truInfo_" in class_name:
-                            continue
+            # Убеждаемся, что таблица на месте после перерисовки
+            if not await wait_for_selector(page, ITEMS_TABLE_SELECTOR, label="items_table"):
+                logger.error("Таблица не загрузилась после перехода на новую страницу")
+                break
 
-                        item = await parse_item_from_row(page, row, item_id)
-                        if item:
-                            items.append(item)
-                            item_id += 1
-                            parsed_on_page += 1
+            page_num += 1
 
-                    logger.info(f"Распарсено {parsed_on_page} товаров на странице {page_num}")
+    except Exception as e:
+        logger.error(f"Ошибка при парсинге обычных товаров: {e}")
 
-                    # Пагинация
-                    if not await go_to_next_page(page):
-                        logger.info("Достигнута последняя страница")
-                        break
 
-                    # Ждем загрузки новой страницы
-                    await page.wait_for_timeout(2000)  # Увеличиваем время ожидания
+async def iter_pages_parallel(page: Page, page_count: int) -> AsyncIterator[List[Item]]:
+    """Позиции по страницам пагинации в нескольких вкладках
 
-                    # Ждем, пока таблица обновится
-                    try:
-                        await page.wait_for_selector("#positionKTRU table.tableBlock", timeout=5000)
-                    except:
-                        logger.error("Таблица не загрузилась после перехода на новую страницу")
-                        break
+    Страницы делятся на непрерывные диапазоны, каждый диапазон парсится
+    в своей вкладке того же контекста (первый - в текущей). Порции отдаются
+    в порядке страниц.
+    """
+    tabs = min(settings.pagination_tabs, page_count)
+    size = math.ceil(page_count / tabs)
+    slices = [
+        list(range(start, min(start + size, page_count + 1)))
+        for start in range(1, page_count + 1, size)
+    ]
 
-                    page_num += 1
+    loop = asyncio.get_running_loop()
+    results = {number: loop.create_future() for number in range(1, page_count + 1)}
+    workers = [
+        asyncio.create_task(
+            parse_pages_slice(
+                page if i == 0 else None,
+                page.context,
+                page.url,
+                numbers,
+                results,
+                until_last=numbers[-1] == page_count,
+            )
+        )
+        for i, numbers in enumerate(slices)
+    ]
 
+    try:
+        for number in range(1, page_count + 1):
+            try:
+                batch = await results[number]
             except Exception as e:
-                logger.error(f"Ошибка при парсинге обычных товаров: {e}")
+                logger.warning(f"Страница {number} не распарсена ({e}), повторяем")
+                batch = await retry_items_page(
+                    page.context, page.url, number, until_last=number == page_count
+                )
+            if batch:
+                yield batch
+    finally:
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        for result in results.values():
+            if result.done() and not result.cancelled():
+                result.exception()
 
-    logger.info(f"Всего найдено товаров: {len(items)}")
-    return items
\ No newline at end of file
+
+async def parse_pages_slice(
+    page: Optional[Page],
+    context: BrowserContext,
+    url: str,
+    numbers: List[int],
+    results: Dict[int, asyncio.Future],
+    until_last: bool = False,
+):
+    """Парсит подряд идущие страницы; без page открывает свою вкладку
+
+    С until_last обход продолжается до последней страницы, даже если
+    пагинатор показал не все номера: лишние позиции добавляются к последней
+    порции.
+    """
+    own_tab = page is None
+    try:
+        if own_tab:
+            page = track_page(await create_page(context))
+            await page.goto(url)
+            if not await wait_for_selector(page, ITEMS_TABLE_SELECTOR, label="items_table"):
+                raise RuntimeError("таблица позиций не загрузилась")
+            if not await go_to_page(page, numbers[0]):
+                raise RuntimeError(f"не удалось перейти на страницу {numbers[0]}")
+
+        for number in numbers:
+            if number != numbers[0]:
+                if not await go_to_next_page(page) or not await wait_for_selector(
+                    page, ITEMS_TABLE_SELECTOR, label="items_table"
+                ):
+                    raise RuntimeError(f"не удалось перейти на страницу {number}")
+
+            batch = await parse_items_page(page, number) or []
+
+            if number == numbers[-1] and until_last:
+                extra_number = number
+                while await go_to_next_page(page) and await wait_for_selector(
+                    page, ITEMS_TABLE_SELECTOR, label="items_table"
+                ):
+                    extra_number += 1
+                    batch.extend(await parse_items_page(page, extra_number) or [])
+
+            results[number].set_result(batch)
+
+    except Exception as e:
+        for number in numbers:
+            if not results[number].done():
+                results[number].set_exception(e)
+    finally:
+        if own_tab and page is not None:
+            await page.close()
+
+
+async def retry_items_page(
+    context: BrowserContext, url: str, number: int, until_last: bool = False
+) -> List[Item]:
+    """Повторный парсинг одной страницы в новой вкладке"""
+    result = {number: asyncio.get_running_loop().create_future()}
+    await parse_pages_slice(None, context, url, [number], result, until_last=until_last)
+    try:
+        return result[number].result()
+    except Exception as e:
+        logger.error(f"Страница {number} пропущена: {e}")
+        return []
+
+
+async def parse_items_page(page: Page, page_num: int) -> Optional[List[Item]]:
+    """Позиции текущей страницы пагинации; None, если таблицы нет"""
+    logger.info(f"Парсинг страницы {page_num}...")
+
+    # Характеристики всех позиций страницы раскрываем разом,
+    # дальше строки разбираются по снимку блока без браузера
+    source = page
+    if settings.bulk_characteristics:
+        source = await expand_item_characteristics(page) or page
+
+    # Заново находим таблицу после каждого перехода страницы
+    current_table = await source.query_selector(ITEMS_TABLE_SELECTOR)
+    if not current_table:
+        logger.error("Таблица не найдена после перехода на страницу")
+        return None
+
+    trace = current_trace()
+    if trace is not None:
+        trace.count("pages")
+
+    # Находим строки товаров на текущей странице
+    item_rows = await current_table.query_selector_all(
+        "tbody.tableBlock__body > tr.tableBlock__row"
+    )
+
+    logger.info(f"Найдено {len(item_rows)} строк на странице {page_num}")
+
+    # Парсим товары с текущей страницы; номера проставляются при объединении
+    batch = []
+    for row in item_rows:
+        # Пропускаем информационные строки
+        class_name = await row.get_attribute("class")
+        if class_name and "truInfo_" in class_name:
+            continue
+
+        item = await parse_item_from_row(source, row, len(batch) + 1)
+        if item:
+            batch.append(item)
+
+    logger.info(f"Распарсено {len(batch)} товаров на странице {page_num}")
+    return batch
@@ -2,56 +2,31 @@ import logging
 import re
 from typing import Optional
 
-from playwright.async_api import Page
-
-from app.utils.expand_elements import expand_collapse_blocks
-from app.utils.format_check import is_paste_format
+from app.parsers.parse_context import ParseContext
+from app.utils.section_index import SectionIndex
 
 logger = logging.getLogger(__name__)
 
 
-async def get_payment_conditions(page: Page) -> Optional[str]:
+async def get_payment_conditions(ctx: ParseContext) -> Optional[str]:
     """Главная функция для извлечения платежных реквизитов"""
     logger.info("Начало извлечения платежных реквизитов")
 
-    if await is_paste_format(page):
-        await expand_collapse_blocks(page)
-        return await parse_payment_conditions_paste(page)
+    if await ctx.is_paste_format():
+        await ctx.expand_collapse_blocks()
+        return await parse_payment_conditions_paste(ctx)
     else:
-        return await parse_payment_conditions_html(page)
+        return await parse_payment_conditions_html(ctx)
 
 
-async def parse_payment_conditions_paste(page: Page) -> Optional[str]:
+async def parse_payment_conditions_paste(ctx: ParseContext) -> Optional[str]:
     """Извлечение платежных реквизитов для формата paste"""
     logger.debug("Используется парсер для формата paste")
 
     try:
-        # 1. Платежные реквизиты
-        element = await page.query_selector(
-            "div.collapse__content section:has(span.section__title:has-text('Платежные реквизиты'):not(:has-text('обеспечения'))) span.section__info"
-        )
-        if element:
-            requisites = await element.text_content()
-            logger.info(f"Найдены платежные реквизиты: {requisites[:50]}...")
-            return requisites.strip()
-
-        # 2. Банковские реквизиты
-        element = await page.query_selector(
-            "div.collapse__content section:has(span.section__title:has-text('Банковские реквизиты'), span.section__title:has-text('Реквизиты счета')) span.section__info"
-        )
-        if element:
-            requisites = await element.text_content()
-            logger.info(f"Найдены банковские реквизиты: {requisites[:50]}...")
-            return requisites.strip()
-
-        # 3. Реквизиты для обеспечения как fallback
-        element = await page.query_selector(
-            "div.collapse__content section:has(span.section__title:has-text('Платежные реквизиты для обеспечения исполнения контракта')) span.section__info"
-        )
-        if element:
-            requisites = await element.text_content()
-            requisites = re.sub(r"\s+", " ", requisites.strip())
-            logger.info(f"Найдены реквизиты для обеспечения: {requisites[:50]}...")
+        index = await ctx.section_index()
+        requisites = find_payment_conditions(index, collapsed_only=True)
+        if requisites:
             return requisites
 
         logger.warning("Платежные реквизиты не найдены в формате paste")
@@ -62,37 +37,14 @@ async def parse_payment_conditions_paste(page: Page) -> Optional[str]:
         return None
 
 
-async def parse_payment_conditions_html(page: Page) -> Optional[str]:
+async def parse_payment_conditions_html(ctx: ParseContext) -> Optional[str]:
     """Извлечение платежных реквизитов для формата html_content"""
     logger.debug("Используется парсер для формата html_content")
 
     try:
-        # 1. Платежные реквизиты
-        element = await page.query_selector(
-            "section:has(span.section__title:has-text('Платежные реквизиты'):not(:has-text('обеспечения'))) span.section__info"
-        )
-        if element:
-            requisites = await element.text_content()
-            logger.info(f"Найдены платежные реквизиты: {requisites[:50]}...")
-            return requisites.strip()
-
-        # 2. Банковские реквизиты
-        element = await page.query_selector(
-            "section:has(span.section__title:has-text('Банковские реквизиты'), span.section__title:has-text('Реквизиты счета')) span.section__info"
-        )
-        if element:
-            requisites = await element.text_content()
-            logger.info(f"Найдены банковские реквизиты: {requisites[:50]}...")
-            return requisites.strip()
-
-        # 3. Реквизиты для обеспечения как fallback
-        element = await page.query_selector(
-            "section:has(span.section__title:has-text('Платежные реквизиты для обеспечения исполнения контракта')) span.section__info"
-        )
-        if element:
-            requisites = await element.text_content()
-            requisites = re.sub(r"\s+", " ", requisites.strip())
-            logger.info(f"Найдены реквизиты для обеспечения: {requisites[:50]}...")
+        index = await ctx.section_index()
+        requisites = find_payment_conditions(index, collapsed_only=False)
+        if requisites:
             return requisites
 
         logger.warning("Платежные реквизиты не найдены в формате html_content")
@@ -101,3 +53,37 @@ async def parse_payment_conditions_html(page: Page) -> Optional[str]:
     except Exception as e:
         logger.error(f"Ошибка при парсинге платежных реквизитов (html): {e}")
         return None
+
+
+def find_payment_conditions(
+    index: SectionIndex, collapsed_only: bool
+) -> Optional[str]:
+    """Поиск платежных реквизитов в индексе секций"""
+    # 1. Платежные реквизиты
+    section = index.find(
+        "Платежные реквизиты", exclude=("обеспечения",), collapsed_only=collapsed_only
+    )
+    if section and section.info is not None:
+        requisites = section.info
+        logger.info(f"Найдены платежные реквизиты: {requisites[:50]}...")
+        return requisites.strip()
+
+    # 2. Банковские реквизиты
+    requisites = index.info(
+        "Банковские реквизиты", "Реквизиты счета", collapsed_only=collapsed_only
+    )
+    if requisites is not None:
+        logger.info(f"Найдены банковские реквизиты: {requisites[:50]}...")
+        return requisites.strip()
+
+    # 3. Реквизиты для обеспечения как fallback
+    requisites = index.info(
+        "Платежные реквизиты для обеспечения исполнения контракта",
+        collapsed_only=collapsed_only,
+    )
+    if requisites is not None:
+        requisites = re.sub(r"\s+", " ", requisites.strip())
+        logger.info(f"Найдены реквизиты для обеспечения: {requisites[:50]}...")
+        return requisites
+
+    return None
@@ -1,5 +1,4 @@
-from playwright.async_api import Page
-
+from app.parsers.parse_context import ParseContext
 from app.parsers.tender_feature_parsers.payment_features.conditions import (
     get_payment_conditions,
 )
@@ -10,11 +9,11 @@ from app.parsers.tender_feature_parsers.payment_features.term import get_payment
 from app.schemas.general import PaymentInfo
 
 
-async def get_payment_info(page: Page):
+async def get_payment_info(ctx: ParseContext):
     """Основная функция для получения информации о платежах"""
-    paymentTerm = await get_payment_term(page)
-    paymentMethod = await get_payment_method(page)
-    paymentConditions = await get_payment_conditions(page)
+    paymentTerm = await get_payment_term(ctx)
+    paymentMethod = await get_payment_method(ctx)
+    paymentConditions = await get_payment_conditions(ctx)
 
     return PaymentInfo(
         paymentTerm=paymentTerm,
@@ -1,63 +1,32 @@
 from typing import Optional
 
-from playwright.async_api import Page
-
-from app.utils.format_check import is_paste_format
-from app.utils.expand_elements import expand_collapse_blocks
+from app.parsers.parse_context import ParseContext
+from app.utils.section_index import SectionIndex
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-async def get_financing_source(page: Page) -> Optional[str]:
+async def get_financing_source(ctx: ParseContext) -> Optional[str]:
     """Главная функция для извлечения источника финансирования"""
     logger.info("Начало извлечения источника финансирования")
 
-    if await is_paste_format(page):
-        await expand_collapse_blocks(page)
-        return await parse_financing_source_paste(page)
+    if await ctx.is_paste_format():
+        await ctx.expand_collapse_blocks()
+        return await parse_financing_source_paste(ctx)
     else:
-        return await parse_financing_source_html(page)
+        return await parse_financing_source_html(ctx)
 
 
-async def parse_financing_source_paste(page: Page) -> Optional[str]:
+async def parse_financing_source_paste(ctx: ParseContext) -> Optional[str]:
     """Извлечение источника финансирования для формата paste"""
     logger.debug("Используется парсер для формата paste")
 
     try:
-        # 1. Проверяем собственные средства
-        element = await page.query_selector(
-            "div.collapse__content section:has(span.section__title:has-text('Закупка за счет собственных средств организации')) span.section__info"
-        )
-        if element:
-            text = await element.text_content()
-            if "да" in text.lower():
-                logger.info("Найден источник: Собственные средства организации")
-                return "Собственные средства организации"
-
-        # 2. Проверяем внебюджетные средства
-        element = await page.query_selector(
-            "div.collapse__content span.section__title:has-text('За счет внебюджетных средств')"
-        )
-        if element:
-            logger.info("Найден источник: За счет внебюджетных средств")
-            return "За счет внебюджетных средств"
-
-        # 3. Проверяем бюджетные средства
-        element = await page.query_selector(
-            "div.collapse__content section:has(span.section__title:has-text('Закупка за счет бюджетных средств')) span.section__info"
-        )
-        if element:
-            text = await element.text_content()
-            if "да" in text.lower():
-                budget_name = await find_budget_name_paste(page)
-                if budget_name:
-                    result = f"Бюджетные средства ({budget_name})"
-                    logger.info(f"Найден источник: {result}")
-                    return result
-                else:
-                    logger.info("Найден источник: Бюджетные средства")
-                    return "Бюджетные средства"
+        index = await ctx.section_index()
+        source = find_financing_source(index, collapsed_only=True)
+        if source:
+            return source
 
         logger.warning("Источник финансирования не найден в формате paste")
         return None
@@ -67,44 +36,15 @@ async def parse_financing_source_paste(page: Page) -> Optional[str]:
         return None
 
 
-async def parse_financing_source_html(page: Page) -> Optional[str]:
+async def parse_financing_source_html(ctx: ParseContext) -> Optional[str]:
     """Извлечение источника финансирования для формата html_content"""
     logger.debug("Используется парсер для формата html_content")
 
     try:
-        # 1. Проверяем собственные средства
-        element = await page.query_selector(
-            "section:has(span.section__title:has-text('Закупка за счет собственных средств организации')) span.section__info"
-        )
-        if element:
-            text = await element.text_content()
-            if "да" in text.lower():
-                logger.info("Найден источник: Собственные средства организации")
-                return "Собственные средства организации"
-
-        # 2. Проверяем внебюджетные средства
-        element = await page.query_selector(
-            "span.section__title:has-text('За счет внебюджетных средств')"
-        )
-        if element:
-            logger.info("Найден источник: За счет внебюджетных средств")
-            return "За счет внебюджетных средств"
-
-        # 3. Проверяем бюджетные средства
-        element = await page.query_selector(
-            "section:has(span.section__title:has-text('Закупка за счет бюджетных средств')) span.section__info"
-        )
-        if element:
-            text = await element.text_content()
-            if "да" in text.lower():
-                budget_name = await find_budget_name_html(page)
-                if budget_name:
-                    result = f"Бюджетные средства ({budget_name})"
-                    logger.info(f"Найден источник: {result}")
-                    return result
-                else:
-                    logger.info("Найден источник: Бюджетные средства")
-                    return "Бюджетные средства"
+        index = await ctx.section_index()
+        source = find_financing_source(index, collapsed_only=False)
+        if source:
+            return source
 
         logger.warning("Источник финансирования не найден в формате html_content")
         return None
@@ -114,31 +54,43 @@ async def parse_financing_source_html(page: Page) -> Optional[str]:
         return None
 
 
-async def find_budget_name_paste(page: Page) -> Optional[str]:
-    """Поиск наименования бюджета для формата paste"""
-    try:
-        element = await page.query_selector(
-            "div.collapse__content section:has(span.section__title:text('Наименование бюджета')) span.section__info"
-        )
-        if element:
-            budget_name = await element.text_content()
-            logger.debug(f"Найдено наименование бюджета: {budget_name}")
-            return budget_name.strip()
-    except Exception as e:
-        logger.debug(f"Наименование бюджета не найдено (paste): {e}")
+def find_financing_source(index: SectionIndex, collapsed_only: bool) -> Optional[str]:
+    """Определение источника финансирования по индексу секций"""
+    # 1. Проверяем собственные средства
+    text = index.info(
+        "Закупка за счет собственных средств организации",
+        collapsed_only=collapsed_only,
+    )
+    if text is not None and "да" in text.lower():
+        logger.info("Найден источник: Собственные средства организации")
+        return "Собственные средства организации"
+
+    # 2. Проверяем внебюджетные средства
+    if index.find("За счет внебюджетных средств", collapsed_only=collapsed_only):
+        logger.info("Найден источник: За счет внебюджетных средств")
+        return "За счет внебюджетных средств"
+
+    # 3. Проверяем бюджетные средства
+    text = index.info(
+        "Закупка за счет бюджетных средств", collapsed_only=collapsed_only
+    )
+    if text is not None and "да" in text.lower():
+        budget_name = find_budget_name(index, collapsed_only)
+        if budget_name:
+            result = f"Бюджетные средства ({budget_name})"
+            logger.info(f"Найден источник: {result}")
+            return result
+        else:
+            logger.info("Найден источник: Бюджетные средства")
+            return "Бюджетные средства"
+
     return None
 
 
-async def find_budget_name_html(page: Page) -> Optional[str]:
-    """Поиск наименования бюджета для формата html_content"""
-    try:
-        element = await page.query_selector(
-            "section:has(span.section__title:text('Наименование бюджета')) span.section__info"
-        )
-        if element:
-            budget_name = await element.text_content()
-            logger.debug(f"Найдено наименование бюджета: {budget_name}")
-            return budget_name.strip()
-    except Exception as e:
-        logger.debug(f"Наименование бюджета не найдено (html): {e}")
+def find_budget_name(index: SectionIndex, collapsed_only: bool) -> Optional[str]:
+    """Поиск наименования бюджета"""
+    budget_name = index.info("Наименование бюджета", collapsed_only=collapsed_only)
+    if budget_name is not None:
+        logger.debug(f"Найдено наименование бюджета: {budget_name}")
+        return budget_name.strip()
     return None
@@ -1,5 +1,4 @@
-from playwright.async_api import Page
-
+from app.parsers.parse_context import ParseContext
 from app.parsers.tender_feature_parsers.delivery_info import get_delivery_info
 from app.parsers.tender_feature_parsers.payment_info import get_payment_info
 from app.parsers.tender_feature_parsers.tender_features.customer_name import (
@@ -19,18 +18,21 @@ from app.parsers.tender_feature_parsers.tender_features.tender_number import (
     get_tender_number,
 )
 from app.schemas.general import TenderInfo
+from app.utils.metrics import observe_stage
 
 
-async def get_tender_info(page: Page):
+async def get_tender_info(ctx: ParseContext):
     """Основная функция для получения информации о тендере"""
-    tenderName = await get_tender_name(page)
-    tenderNumber = await get_tender_number(page)
-    customerName = await get_customer_name(page)
-    purchaseType = await get_purchase_type(page)
-    financingSource = await get_financing_source(page)
-    maxPrice = await get_price_info(page)
-    deliveryInfo = await get_delivery_info(page)
-    paymentInfo = await get_payment_info(page)
+    page = ctx.page
+
+    tenderName = await observe_stage("tender_name", get_tender_name(page))
+    tenderNumber = await observe_stage("tender_number", get_tender_number(page))
+    customerName = await observe_stage("customer_name", get_customer_name(page))
+    purchaseType = await observe_stage("purchase_type", get_purchase_type(page))
+    financingSource = await observe_stage("financing_source", get_financing_source(ctx))
+    maxPrice = await observe_stage("max_price", get_price_info(page))
+    deliveryInfo = await observe_stage("delivery", get_delivery_info(ctx))
+    paymentInfo = await observe_stage("payment", get_payment_info(ctx))
 
     return TenderInfo(
         tenderName=tenderName,
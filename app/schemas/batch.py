@@ -0,0 +1,25 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.schemas.tender import TenderData
+
+
+class BatchParseRequest(BaseModel):
+    """Запрос на парсинг нескольких тендеров"""
+
+    urls: List[str] = Field(..., min_length=1, description="Ссылки на тендеры")
+    concurrency: Optional[int] = Field(
+        None, ge=1, description="Сколько тендеров парсить одновременно"
+    )
+    force_refresh: bool = Field(False, description="Не использовать кэш")
+
+
+class BatchParseResult(BaseModel):
+    """Результат парсинга одного тендера из пакета (строка NDJSON)"""
+
+    index: int = Field(..., description="Номер ссылки в запросе")
+    url: str = Field(..., description="Ссылка на тендер")
+    status: str = Field(..., description="ok или error")
+    data: Optional[TenderData] = Field(None, description="Данные тендера")
+    error: Optional[str] = Field(None, description="Текст ошибки")
@@ -0,0 +1,37 @@
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from app.schemas.tender import TenderData
+
+
+class JobStatus(str, Enum):
+    """Состояние задачи парсинга"""
+
+    queued = "queued"
+    running = "running"
+    done = "done"
+    failed = "failed"
+
+
+class JobCreateRequest(BaseModel):
+    """Запрос на постановку тендера в очередь"""
+
+    url: str = Field(..., description="Ссылка на тендер")
+    force_refresh: bool = Field(False, description="Не использовать кэш")
+
+
+class Job(BaseModel):
+    """Задача парсинга тендера"""
+
+    id: str = Field(..., description="Идентификатор задачи")
+    url: str = Field(..., description="Ссылка на тендер")
+    force_refresh: bool = Field(False, description="Не использовать кэш")
+    status: JobStatus = Field(JobStatus.queued, description="Состояние задачи")
+    created_at: datetime = Field(..., description="Время постановки в очередь")
+    started_at: Optional[datetime] = Field(None, description="Время начала парсинга")
+    finished_at: Optional[datetime] = Field(None, description="Время завершения")
+    result: Optional[TenderData] = Field(None, description="Данные тендера")
+    error: Optional[str] = Field(None, description="Текст ошибки")
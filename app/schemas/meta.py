@@ -0,0 +1,23 @@
+from typing import Dict
+
+from pydantic import BaseModel, Field
+
+
+class StageTiming(BaseModel):
+    """Суммарное время этапа парсинга"""
+
+    ms: float = Field(..., description="Время, мс")
+    count: int = Field(..., description="Сколько раз выполнялся этап")
+
+
+class ParseMeta(BaseModel):
+    """Из чего сложилось время парсинга тендера (блок _meta ответа)"""
+
+    source: str = Field(..., description="parse, cache или coalesced (ожидание общего парсинга)")
+    totalMs: float = Field(..., description="Время обработки запроса, мс")
+    stages: Dict[str, StageTiming] = Field(
+        default_factory=dict, description="Этапы в порядке выполнения"
+    )
+    counts: Dict[str, int] = Field(
+        default_factory=dict, description="Позиции, страницы, документы и т.п."
+    )
@@ -0,0 +1,14 @@
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class TenderStreamEvent(BaseModel):
+    """Порция данных тендера при потоковом парсинге
+
+    События идут в порядке: tenderInfo, items (по странице пагинации),
+    generalRequirements, attachments, done. При ошибке - error.
+    """
+
+    event: str = Field(..., description="Тип события")
+    data: Any = Field(None, description="Данные события")
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import time
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from app.core.settings import settings
+from app.schemas.jobs import Job, JobStatus
+from app.services.parser_service import parser
+from app.utils.validator import validate_tender_url
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueFull(Exception):
+    """Очередь задач заполнена"""
+
+
+class JobStore(ABC):
+    """Хранилище задач; реализация может быть внешней (Redis, БД)"""
+
+    @abstractmethod
+    async def save(self, job: Job):
+        """Сохраняет новую задачу или ее новое состояние"""
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[Job]:
+        """Задача по идентификатору или None"""
+
+
+class InMemoryJobStore(JobStore):
+    """Задачи в памяти процесса; завершенные удаляются через ttl секунд"""
+
+    def __init__(self, ttl: int = None):
+        self.ttl = ttl if ttl is not None else settings.job_ttl
+        self._jobs: Dict[str, Tuple[Job, float]] = {}
+
+    async def save(self, job: Job):
+        self._cleanup()
+        self._jobs[job.id] = (job, time.monotonic())
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        self._cleanup()
+        entry = self._jobs.get(job_id)
+        return entry[0] if entry else None
+
+    def _cleanup(self):
+        deadline = time.monotonic() - self.ttl
+        expired = [
+            job_id
+            for job_id, (job, saved_at) in self._jobs.items()
+            if job.status in (JobStatus.done, JobStatus.failed) and saved_at < deadline
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+class JobService:
+    """Очередь задач парсинга с фиксированным числом воркеров"""
+
+    def __init__(self, store: JobStore = None, workers: int = None):
+        self.store = store or InMemoryJobStore()
+        self.workers_count = workers or settings.job_workers
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    @property
+    def is_started(self) -> bool:
+        return bool(self._workers)
+
+    async def start(self):
+        """Запуск воркеров"""
+        if self.is_started:
+            return
+
+        self._queue = asyncio.Queue(maxsize=settings.job_queue_size)
+        self._workers = [
+            asyncio.create_task(self._worker(i)) for i in range(self.workers_count)
+        ]
+        logger.info(f"Запущено воркеров задач: {self.workers_count}")
+
+    async def stop(self):
+        """Остановка воркеров; незавершенные задачи остаются в хранилище"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    async def submit(self, url: str, force_refresh: bool = False) -> Job:
+        """Ставит тендер в очередь и сразу возвращает задачу"""
+        is_valid, error = validate_tender_url(url)
+        if not is_valid:
+            raise ValueError(error)
+
+        if not self.is_started:
+            # Сервис используется вне приложения (скрипты, тесты)
+            await self.start()
+
+        job = Job(
+            id=uuid.uuid4().hex,
+            url=url,
+            force_refresh=force_refresh,
+            created_at=datetime.now(timezone.utc),
+        )
+        # Сначала сохраняем: воркер может забрать id из очереди раньше, чем
+        # внешнее хранилище завершит запись
+        await self.store.save(job)
+        try:
+            self._queue.put_nowait(job.id)
+        except asyncio.QueueFull:
+            job.status = JobStatus.failed
+            job.error = "Очередь задач заполнена"
+            job.finished_at = datetime.now(timezone.utc)
+            await self.store.save(job)
+            raise JobQueueFull("Очередь задач заполнена, повторите позже")
+
+        logger.info(f"Задача {job.id} поставлена в очередь: {url}")
+        return job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        return await self.store.get(job_id)
+
+    async def _worker(self, number: int):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except Exception as e:
+                logger.error(f"Воркер {number}: ошибка задачи {job_id}: {e}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str):
+        job = await self.store.get(job_id)
+        if job is None:
+            return
+
+        job.status = JobStatus.running
+        job.started_at = datetime.now(timezone.utc)
+        await self.store.save(job)
+
+        try:
+            job.result = await parser.start_parsing(
+                job.url, force_refresh=job.force_refresh
+            )
+            job.status = JobStatus.done
+        except Exception as e:
+            job.error = str(e) or repr(e)
+            job.status = JobStatus.failed
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+            await self.store.save(job)
+
+        logger.info(f"Задача {job.id} завершена: {job.status.value}")
+
+
+job_service = JobService()
@@ -1,7 +1,16 @@
+import asyncio
 import logging
-from app.parsers.all_tender_info import get_tender
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, List, Tuple
+
+from app.parsers.all_tender_info import get_tender, iter_tender
+from app.core.settings import settings
+from app.schemas.batch import BatchParseResult
+from app.schemas.stream import TenderStreamEvent
 from app.schemas.tender import TenderData
-from app.utils.validator import validate_tender_url
+from app.services.tender_cache import TenderCache
+from app.utils.tender_trace import TenderTrace, current_trace
+from app.utils.validator import extract_reg_number, validate_tender_url
 
 logger = logging.getLogger(__name__)
 
@@ -9,25 +18,148 @@ logger = logging.getLogger(__name__)
 class ParserService:
     def __init__(self):
         self._parse_count = 0
+        self.cache = TenderCache()
+        # Парсинги, которые выполняются прямо сейчас, по regNumber
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.coalesced = 0
+
+    async def start_parsing(self, url: str, force_refresh: bool = False) -> TenderData:
+        """Парсинг с валидацией и обработкой ошибок
+
+        Повторные запросы того же тендера отдаются из кэша, пока не истек TTL;
+        force_refresh заставляет распарсить тендер заново. Одновременные
+        запросы одного тендера ждут общий парсинг.
+        """
+        tender, _ = await self.parse_traced(url, force_refresh=force_refresh)
+        return tender
 
-    async def start_parsing(self, url: str) -> TenderData:
-        """Парсинг с валидацией и обработкой ошибок"""
+    async def parse_traced(
+        self, url: str, force_refresh: bool = False
+    ) -> Tuple[TenderData, TenderTrace]:
+        """То же, что start_parsing, вместе с временем этапов парсинга"""
         # Валидация URL
         is_valid, error = validate_tender_url(url)
         if not is_valid:
             logger.error(f"Невалидный URL: {error}")
             raise ValueError(error)
 
+        reg_number = extract_reg_number(url)
+        if not force_refresh:
+            cached = self.cache.get(reg_number)
+            if cached is not None:
+                logger.info(f"Тендер {reg_number} отдан из кэша")
+                return cached, TenderTrace(source="cache")
+
+        task = self._in_flight.get(reg_number)
+        joined = task is not None
+        if joined:
+            self.coalesced += 1
+            logger.info(f"Тендер {reg_number} уже парсится, ждем результат")
+        else:
+            task = asyncio.create_task(self._parse(url, reg_number))
+            self._in_flight[reg_number] = task
+            task.add_done_callback(lambda done: self._finish_flight(reg_number, done))
+
+        # Отмена одного ожидающего запроса не должна прерывать парсинг для остальных
+        tender, trace = await asyncio.shield(task)
+        if joined:
+            trace = trace.with_source("coalesced")
+        return tender, trace
+
+    def stream_parsing(
+        self, url: str, force_refresh: bool = False
+    ) -> AsyncIterator[TenderStreamEvent]:
+        """Потоковый парсинг: данные тендера отдаются по мере разбора
+
+        URL проверяется сразу, до начала потока. Результат из кэша отдается
+        теми же событиями; свежий результат в кэш не попадает, чтобы не
+        держать в памяти все позиции большого тендера.
+        """
+        is_valid, error = validate_tender_url(url)
+        if not is_valid:
+            logger.error(f"Невалидный URL: {error}")
+            raise ValueError(error)
+
+        if not force_refresh:
+            cached = self.cache.get(extract_reg_number(url))
+            if cached is not None:
+                logger.info(f"Тендер {extract_reg_number(url)} отдан из кэша")
+                return self._replay(cached)
+
+        return self._stream(url)
+
+    async def _stream(self, url: str) -> AsyncIterator[TenderStreamEvent]:
+        logger.info(f"Начало потокового парсинга тендера #{self._parse_count + 1}: {url}")
+
+        async with aclosing(iter_tender(url)) as events:
+            async for event in events:
+                yield event
+
+        self._parse_count += 1
+        yield TenderStreamEvent(event="done")
+
+    @staticmethod
+    async def _replay(tender: TenderData) -> AsyncIterator[TenderStreamEvent]:
+        yield TenderStreamEvent(event="tenderInfo", data=tender.tenderInfo)
+        if tender.items:
+            yield TenderStreamEvent(event="items", data=tender.items)
+        yield TenderStreamEvent(
+            event="generalRequirements", data=tender.generalRequirements
+        )
+        yield TenderStreamEvent(event="attachments", data=tender.attachments)
+        yield TenderStreamEvent(event="done")
+
+    async def parse_batch(
+        self, urls: List[str], concurrency: int = None, force_refresh: bool = False
+    ) -> AsyncIterator[BatchParseResult]:
+        """Парсинг нескольких тендеров, результаты отдаются по мере готовности
+
+        Одновременно парсится не больше concurrency тендеров; ошибка одной
+        ссылки не прерывает остальные.
+        """
+        limit = min(concurrency or settings.batch_concurrency, settings.batch_concurrency)
+        semaphore = asyncio.Semaphore(limit)
+        logger.info(f"Пакетный парсинг: {len(urls)} тендеров, параллельно {limit}")
+
+        async def parse_one(index: int, url: str) -> BatchParseResult:
+            async with semaphore:
+                try:
+                    data = await self.start_parsing(url, force_refresh=force_refresh)
+                    return BatchParseResult(index=index, url=url, status="ok", data=data)
+                except Exception as e:
+                    return BatchParseResult(
+                        index=index, url=url, status="error", error=str(e) or repr(e)
+                    )
+
+        tasks = [asyncio.create_task(parse_one(i, url)) for i, url in enumerate(urls)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Клиент отключился - оставшиеся тендеры не нужны
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _parse(self, url: str, reg_number: str) -> Tuple[TenderData, TenderTrace]:
         logger.info(f"Начало парсинга тендера #{self._parse_count + 1}: {url}")
 
         try:
             result = await get_tender(url)
             self._parse_count += 1
+            self.cache.put(reg_number, result)
             logger.info(f"Успешно распарсен тендер. Позиций: {len(result.items)}")
-            return result
+            # Этапы собраны get_tender в контексте этой задачи
+            return result, current_trace() or TenderTrace()
         except Exception as e:
             logger.error(f"Ошибка парсинга: {str(e)}", exc_info=True)
             raise
 
+    def _finish_flight(self, reg_number: str, task: asyncio.Task):
+        if self._in_flight.get(reg_number) is task:
+            del self._in_flight[reg_number]
+        # Ошибка уже отдана ожидающим; забираем ее, если все они отменились
+        if not task.cancelled():
+            task.exception()
 
 parser = ParserService()
\ No newline at end of file
@@ -0,0 +1,108 @@
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.settings import settings
+from app.schemas.tender import TenderData
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    data: TenderData
+    size: int
+    expires_at: float
+
+
+class TenderCache:
+    """Кэш результатов парсинга по regNumber
+
+    Записи живут ttl секунд; при превышении max_bytes вытесняются
+    давно не запрашивавшиеся тендеры (LRU).
+    """
+
+    def __init__(self, ttl: int = None, max_bytes: int = None):
+        self.ttl = ttl if ttl is not None else settings.cache_ttl
+        self.max_bytes = max_bytes if max_bytes is not None else settings.cache_max_bytes
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_bytes > 0
+
+    def get(self, reg_number: str) -> Optional[TenderData]:
+        """Результат из кэша или None; устаревшие записи удаляются"""
+        entry = self._entries.get(reg_number)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            self._remove(reg_number)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(reg_number)
+        self.hits += 1
+        return entry.data
+
+    def put(self, reg_number: str, data: TenderData):
+        """Сохраняет результат и вытесняет старые записи сверх лимита"""
+        if not self.enabled:
+            return
+
+        size = len(data.model_dump_json().encode("utf-8"))
+        if size > self.max_bytes:
+            logger.warning(
+                f"Тендер {reg_number} ({size} байт) больше лимита кэша, не сохраняем"
+            )
+            return
+
+        if reg_number in self._entries:
+            self._remove(reg_number)
+
+        self._entries[reg_number] = CacheEntry(
+            data=data, size=size, expires_at=time.monotonic() + self.ttl
+        )
+        self._bytes += size
+
+        while self._bytes > self.max_bytes:
+            evicted, _ = next(iter(self._entries.items()))
+            self._remove(evicted)
+            self.evictions += 1
+            logger.debug(f"Из кэша вытеснен тендер {evicted}")
+
+    def invalidate(self, reg_number: str):
+        if reg_number in self._entries:
+            self._remove(reg_number)
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def _remove(self, reg_number: str):
+        entry = self._entries.pop(reg_number)
+        self._bytes -= entry.size
@@ -0,0 +1,138 @@
+import inspect
+import logging
+import sys
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from playwright.async_api import ElementHandle, Page
+
+from app.core.settings import settings
+from app.utils.metrics import BROWSER_CALL_SECONDS, BROWSER_CALLS
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserCallStats:
+    """Количество и суммарное время вызовов Playwright по местам вызова"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        # (module:function, метод) -> {"count", "total", "max"}
+        self.by_site: Dict[Tuple[str, str], Dict[str, float]] = {}
+
+    def record(self, site: str, method: str, seconds: float):
+        self.count += 1
+        self.total += seconds
+        stats = self.by_site.setdefault(
+            (site, method), {"count": 0, "total": 0.0, "max": 0.0}
+        )
+        stats["count"] += 1
+        stats["total"] += seconds
+        stats["max"] = max(stats["max"], seconds)
+
+    def top(self, limit: int = None) -> List[dict]:
+        """Места вызова, отсортированные по суммарному времени"""
+        rows = [
+            {"site": site, "method": method, **stats}
+            for (site, method), stats in self.by_site.items()
+        ]
+        rows.sort(key=lambda row: -row["total"])
+        return rows[:limit] if limit is not None else rows
+
+    def summary(self, limit: int = None) -> str:
+        parts = [
+            f"{row['site']} {row['method']}: {row['count']} за {row['total']:.2f}с"
+            for row in self.top(limit)
+        ]
+        details = f" ({', '.join(parts)})" if parts else ""
+        return f"{self.count} вызовов браузера за {self.total:.2f}с{details}"
+
+
+_current_stats: ContextVar[Optional[BrowserCallStats]] = ContextVar(
+    "current_browser_call_stats", default=None
+)
+
+
+def track_browser_calls() -> Optional[BrowserCallStats]:
+    """Начинает учет вызовов браузера для текущей задачи (одного тендера)
+
+    Возвращает None, если учет отключен настройкой browser_call_tracking.
+    """
+    if not settings.browser_call_tracking:
+        return None
+    stats = BrowserCallStats()
+    _current_stats.set(stats)
+    return stats
+
+
+def track_page(page: Page) -> Page:
+    """Оборачивает страницу для учета вызовов, если учет включен для задачи"""
+    stats = _current_stats.get()
+    if stats is None or isinstance(page, TrackedHandle):
+        return page
+    return TrackedHandle(page, stats)
+
+
+def _call_site(frame) -> str:
+    # Вызовы из генераторов списков относим к объемлющей функции
+    while frame.f_back is not None and frame.f_code.co_name in (
+        "<listcomp>", "<genexpr>", "<dictcomp>", "<setcomp>", "<lambda>"
+    ):
+        frame = frame.f_back
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+
+def _unwrap(value):
+    if isinstance(value, TrackedHandle):
+        return value._target
+    if isinstance(value, (list, tuple)):
+        return type(value)(_unwrap(item) for item in value)
+    return value
+
+
+class TrackedHandle:
+    """Прокси над Page/ElementHandle, замеряющий каждый асинхронный вызов
+
+    Место вызова - функция, из которой вызван метод. Возвращенные страницы и
+    элементы тоже оборачиваются, поэтому учитываются и вызовы на найденных
+    элементах (text_content, get_attribute, click...).
+    """
+
+    def __init__(self, target, stats: BrowserCallStats):
+        self._target = target
+        self._stats = stats
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._target, name)
+        if not inspect.iscoroutinefunction(attr):
+            return attr
+
+        site = _call_site(sys._getframe(1))
+        stats = self._stats
+
+        async def tracked(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = await attr(
+                    *_unwrap(args), **{key: _unwrap(value) for key, value in kwargs.items()}
+                )
+            finally:
+                seconds = time.perf_counter() - started
+                stats.record(site, name, seconds)
+                BROWSER_CALLS.labels(site, name).inc()
+                BROWSER_CALL_SECONDS.labels(site, name).inc(seconds)
+            return self._wrap(result)
+
+        return tracked
+
+    def _wrap(self, result):
+        if isinstance(result, (Page, ElementHandle)):
+            return TrackedHandle(result, self._stats)
+        if isinstance(result, list):
+            return [self._wrap(item) for item in result]
+        return result
+
+    def __repr__(self) -> str:
+        return f"TrackedHandle({self._target!r})"
@@ -0,0 +1,333 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Deque, List, Optional, Set
+
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    Page,
+    Playwright,
+    async_playwright,
+)
+
+from app.core.settings import settings
+from app.utils.har_replay import get_har_replay
+from app.utils.request_blocking import install_request_blocking
+
+logger = logging.getLogger(__name__)
+
+
+BROWSER_ARGS = [
+    # Основные для стабильности
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--disable-dev-shm-usage",
+
+    # Отключение ненужных функций
+    "--disable-gpu",
+    "--disable-web-security",  # нужно для кросс-доменных запросов
+    "--disable-features=IsolateOrigins,site-per-process",
+
+    # Производительность
+    "--disable-extensions",
+    "--disable-plugins",
+
+    # Уменьшение использования памяти
+    "--memory-pressure-off",
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+
+    # Антидетект
+    "--disable-blink-features=AutomationControlled",
+]
+
+CONTEXT_OPTIONS = dict(
+    viewport={"width": 1920, "height": 1080},
+    user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    ignore_https_errors=True,
+    java_script_enabled=True,  # JS нужен для работы сайта
+    bypass_csp=True,
+    locale="ru-RU",
+    timezone_id="Europe/Moscow",
+    extra_http_headers={
+        "Accept-Language": "ru-RU,ru;q=0.9,en;q=0.8",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+        "Accept-Encoding": "gzip, deflate, br",
+        "Cache-Control": "no-cache",
+        "Pragma": "no-cache",
+        "Connection": "keep-alive",
+        "Upgrade-Insecure-Requests": "1",
+    },
+)
+
+# Эмуляция реального браузера
+INIT_SCRIPT = """
+    // Переопределяем webdriver
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+
+    // Chrome
+    window.chrome = {
+        runtime: {},
+    };
+
+    // Permissions
+    const originalQuery = window.navigator.permissions.query;
+    window.navigator.permissions.query = (parameters) => (
+        parameters.name === 'notifications' ?
+            Promise.resolve({ state: Notification.permission }) :
+            originalQuery(parameters)
+    );
+
+    // Plugins
+    Object.defineProperty(navigator, 'plugins', {
+        get: () => [1, 2, 3, 4, 5],
+    });
+
+    // Languages
+    Object.defineProperty(navigator, 'languages', {
+        get: () => ['ru-RU', 'ru', 'en-US', 'en'],
+    });
+"""
+
+
+async def launch_browser(playwright: Playwright, headless: bool) -> Browser:
+    """Запуск Chromium с настройками парсера"""
+    return await playwright.chromium.launch(headless=headless, args=BROWSER_ARGS)
+
+
+async def create_context(
+    browser: Browser, record_har_path: Optional[str] = None
+) -> BrowserContext:
+    """Создает контекст с настройками и скриптом эмуляции реального браузера
+
+    С record_har_path трафик контекста пишется в HAR при его закрытии; для
+    контекстов пула не используется - они живут много тендеров и писали бы
+    в один файл.
+    """
+    options = dict(CONTEXT_OPTIONS)
+    if record_har_path:
+        options.update(record_har_path=record_har_path, record_har_content="embed")
+
+    context = await browser.new_context(**options)
+    try:
+        await context.add_init_script(INIT_SCRIPT)
+
+        replay = get_har_replay()
+        if replay is not None:
+            # Все ответы берутся из записи, сеть не нужна
+            await replay.install(context)
+        else:
+            # Картинки, шрифты и счетчики отменяем на уровне контекста
+            await install_request_blocking(context)
+    except Exception:
+        await context.close()
+        raise
+    return context
+
+
+async def create_page(context: BrowserContext) -> Page:
+    """Создает страницу с таймаутами из настроек"""
+    page = await context.new_page()
+    page.set_default_timeout(settings.browser_timeout)
+    page.set_default_navigation_timeout(settings.browser_timeout)
+    return page
+
+
+class PooledContext:
+    """Прогретый контекст браузера вместе со своей страницей"""
+
+    def __init__(self, browser: Browser, context: BrowserContext, page: Page):
+        self.browser = browser
+        self.context = context
+        self.page = page
+        self.created_at = time.monotonic()
+        self.uses = 0
+
+    @property
+    def is_alive(self) -> bool:
+        return self.browser.is_connected() and not self.page.is_closed()
+
+    @property
+    def is_expired(self) -> bool:
+        age = time.monotonic() - self.created_at
+        return (
+            self.uses >= settings.context_max_uses
+            or age >= settings.context_max_age
+        )
+
+    async def reset(self):
+        """Сброс состояния между тендерами: лишние вкладки, страница и cookies"""
+        for page in self.context.pages:
+            if page is not self.page:
+                await page.close()
+        await self.page.goto("about:blank")
+        await self.context.clear_cookies()
+
+    async def close(self):
+        try:
+            await self.context.close()
+        except Exception as e:
+            logger.debug(f"Ошибка при закрытии контекста: {e}")
+
+
+class BrowserPool:
+    """Пул долгоживущих браузеров и прогретых контекстов"""
+
+    def __init__(
+        self, size: int = None, contexts: int = None, headless: bool = None
+    ):
+        self.size = max(1, size if size is not None else settings.browser_pool_size)
+        self.contexts = max(
+            0, contexts if contexts is not None else settings.context_pool_size
+        )
+        self.headless = (
+            headless if headless is not None else settings.browser_headless
+        )
+        self._playwright: Optional[Playwright] = None
+        self._browsers: List[Browser] = []
+        self._next = 0
+        self._idle: Deque[PooledContext] = deque()
+        self._tasks: Set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_started(self) -> bool:
+        return self._playwright is not None
+
+    async def start(self):
+        """Запуск playwright, браузеров и прогрев контекстов"""
+        async with self._lock:
+            if self._playwright is not None:
+                return
+
+            self._playwright = await async_playwright().start()
+            try:
+                for _ in range(self.size):
+                    self._browsers.append(
+                        await launch_browser(self._playwright, self.headless)
+                    )
+            except Exception:
+                await self._close_all()
+                raise
+
+        for _ in range(self.contexts):
+            self._idle.append(await self._new_context())
+
+        logger.info(
+            f"Пул браузеров запущен, браузеров: {self.size}, контекстов: {self.contexts}"
+        )
+
+    async def stop(self):
+        """Закрытие контекстов, браузеров пула и остановка playwright"""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        async with self._lock:
+            while self._idle:
+                await self._idle.popleft().close()
+            await self._close_all()
+
+        logger.info("Пул браузеров остановлен")
+
+    async def acquire_context(self) -> PooledContext:
+        """Выдает прогретый контекст, пересоздавая устаревшие"""
+        while self._idle:
+            pooled = self._idle.popleft()
+            if pooled.is_alive and not pooled.is_expired:
+                return pooled
+
+            logger.debug(f"Контекст списан после {pooled.uses} использований")
+            self._spawn(pooled.close())
+            self._spawn(self._refill())
+
+        # Прогретых контекстов нет - создаем на месте
+        return await self._new_context()
+
+    def release_context(self, pooled: PooledContext):
+        """Возвращает контекст в пул, сброс выполняется в фоне"""
+        pooled.uses += 1
+        self._spawn(self._recycle(pooled))
+
+    async def _recycle(self, pooled: PooledContext):
+        if (
+            self.is_started
+            and pooled.is_alive
+            and not pooled.is_expired
+            and len(self._idle) < self.contexts
+        ):
+            try:
+                await pooled.reset()
+                self._idle.append(pooled)
+                return
+            except Exception as e:
+                logger.warning(f"Не удалось сбросить контекст: {e}")
+
+        await pooled.close()
+        await self._refill()
+
+    async def _refill(self):
+        """Дополняет пул прогретых контекстов до заданного размера"""
+        if not self.is_started or len(self._idle) >= self.contexts:
+            return
+        try:
+            self._idle.append(await self._new_context())
+        except Exception as e:
+            logger.warning(f"Не удалось прогреть контекст: {e}")
+
+    async def _new_context(self) -> PooledContext:
+        browser = await self._acquire_browser()
+        context = await create_context(browser)
+        try:
+            page = await create_page(context)
+        except Exception:
+            await context.close()
+            raise
+        return PooledContext(browser, context, page)
+
+    async def _acquire_browser(self) -> Browser:
+        """Возвращает следующий браузер пула, перезапуская отвалившиеся"""
+        async with self._lock:
+            if self._playwright is None:
+                raise RuntimeError("Пул браузеров не запущен")
+
+            index = self._next
+            self._next = (self._next + 1) % len(self._browsers)
+
+            browser = self._browsers[index]
+            if not browser.is_connected():
+                logger.warning(f"Браузер #{index + 1} отключился, перезапускаем")
+                browser = await launch_browser(self._playwright, self.headless)
+                self._browsers[index] = browser
+
+            return browser
+
+    async def drain(self):
+        """Дожидается фоновых задач пула (сброс, пополнение, закрытие контекстов)"""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _close_all(self):
+        for browser in self._browsers:
+            try:
+                await browser.close()
+            except Exception as e:
+                logger.warning(f"Ошибка при закрытии браузера: {e}")
+        self._browsers = []
+        self._next = 0
+
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+browser_pool = BrowserPool()
@@ -1,7 +1,20 @@
+import logging
+import time
 from contextlib import asynccontextmanager
-from playwright.async_api import async_playwright
+from playwright.async_api import Page, async_playwright
 
 from app.core.settings import settings
+from app.utils.browser_calls import track_page
+from app.utils.metrics import record_stage, track_stage
+from app.utils.browser_pool import (
+    browser_pool,
+    create_context,
+    create_page,
+    launch_browser,
+)
+from app.utils.request_blocking import get_request_blocker
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
@@ -10,93 +23,50 @@ async def get_page(headless: bool = None):
     if headless is None:
         headless = settings.browser_headless
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(
-            headless=headless,
-            args=[
-                # Основные для стабильности
-                "--no-sandbox",
-                "--disable-setuid-sandbox",
-                "--disable-dev-shm-usage",
-
-                # Отключение ненужных функций
-                "--disable-gpu",
-                "--disable-web-security",  # нужно для кросс-доменных запросов
-                "--disable-features=IsolateOrigins,site-per-process",
-
-                # Производительность
-                "--disable-extensions",
-                "--disable-plugins",
-                "--disable-images",  # не загружаем картинки
-
-                # Уменьшение использования памяти
-                "--memory-pressure-off",
-                "--disable-background-timer-throttling",
-                "--disable-renderer-backgrounding",
-
-                # Антидетект
-                "--disable-blink-features=AutomationControlled",
-            ],
-        )
-
-        context = await browser.new_context(
-            viewport={"width": 1920, "height": 1080},
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            ignore_https_errors=True,
-            java_script_enabled=True,  # JS нужен для работы сайта
-            bypass_csp=True,
-            locale="ru-RU",
-            timezone_id="Europe/Moscow",
-            extra_http_headers={
-                "Accept-Language": "ru-RU,ru;q=0.9,en;q=0.8",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                "Accept-Encoding": "gzip, deflate, br",
-                "Cache-Control": "no-cache",
-                "Pragma": "no-cache",
-                "Connection": "keep-alive",
-                "Upgrade-Insecure-Requests": "1",
-            },
-        )
-
-        page = await context.new_page()
-
-        # Настройки страницы
-        page.set_default_timeout(settings.browser_timeout)
-        page.set_default_navigation_timeout(settings.browser_timeout)
-
-        # Эмуляция реального браузера
-        await page.add_init_script("""
-            // Переопределяем webdriver
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined
-            });
-
-            // Chrome 
-            window.chrome = {
-                runtime: {},
-            };
-
-            // Permissions
-            const originalQuery = window.navigator.permissions.query;
-            window.navigator.permissions.query = (parameters) => (
-                parameters.name === 'notifications' ?
-                    Promise.resolve({ state: Notification.permission }) :
-                    originalQuery(parameters)
-            );
-
-            // Plugins
-            Object.defineProperty(navigator, 'plugins', {
-                get: () => [1, 2, 3, 4, 5],
-            });
-
-            // Languages
-            Object.defineProperty(navigator, 'languages', {
-                get: () => ['ru-RU', 'ru', 'en-US', 'en'],
-            });
-        """)
+    # Запись HAR идет только в отдельном контексте, который закрывается сразу
+    # после тендера; прогретые контексты пула для этого не подходят
+    use_pool = not settings.har_record_path
+    if use_pool and browser_pool.is_started and headless == browser_pool.headless:
+        async with track_stage("browser_acquire"):
+            pooled = await browser_pool.acquire_context()
+        try:
+            async with report_blocking(pooled.page):
+                yield track_page(pooled.page)
+        finally:
+            browser_pool.release_context(pooled)
+        return
 
+    # Пул не запущен (например, вызов вне приложения) или идет запись HAR -
+    # запускаем отдельный браузер
+    async with async_playwright() as p:
+        started = time.perf_counter()
+        browser = await launch_browser(p, headless)
         try:
-            yield page
+            context = await create_context(
+                browser, record_har_path=settings.har_record_path
+            )
+            try:
+                page = await create_page(context)
+                record_stage("browser_acquire", time.perf_counter() - started, "success")
+                async with report_blocking(page):
+                    yield track_page(page)
+            finally:
+                # HAR-запись сохраняется при закрытии контекста
+                await context.close()
         finally:
-            await context.close()
-            await browser.close()
\ No newline at end of file
+            await browser.close()
+
+
+@asynccontextmanager
+async def report_blocking(page: Page):
+    """Логирует, сколько запросов заблокировано за время работы со страницей"""
+    blocker = get_request_blocker(page.context)
+    if blocker is None:
+        yield
+        return
+
+    blocker.reset()
+    try:
+        yield
+    finally:
+        logger.info(f"Блокировка запросов: {blocker.stats.summary()}")
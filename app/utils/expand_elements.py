@@ -1,47 +1,229 @@
-import asyncio
 import logging
 
+from typing import Optional
+
 from playwright.async_api import Page
 
+from app.core.settings import settings
+from app.utils.html_snapshot import HtmlSnapshot
+from app.utils.waiting import wait_for_condition
+
 logger = logging.getLogger(__name__)
 
 
+# Кликает все свернутые заголовки за один вызов, возвращает их количество
+EXPAND_COLLAPSE_SCRIPT = """
+() => {
+    const titles = Array.from(
+        document.querySelectorAll('div.collapse__title:not(.collapse__title_opened)')
+    );
+    titles.forEach((title) => title.click());
+    return titles.length;
+}
+"""
+
+# Все блоки раскрыты и содержимое каждого блока на месте
+COLLAPSE_OPENED_CONDITION = """
+() => Array.from(document.querySelectorAll('div.collapse__title')).every((title) => {
+    if (!title.classList.contains('collapse__title_opened')) {
+        return false;
+    }
+    const content = title.parentElement
+        ? title.parentElement.querySelector('.collapse__content')
+        : null;
+    return content === null || content.childElementCount > 0;
+})
+"""
+
+# Кликает все ссылки "Показать больше/все", запоминая их исходный текст
+# и число документов в их блоке
+EXPAND_DOCUMENTS_SCRIPT = """
+() => {
+    const labels = ['показать больше', 'показать все'];
+    const links = Array.from(document.querySelectorAll('a')).filter((link) => {
+        const text = link.textContent.trim().toLowerCase();
+        return labels.some((label) => text.includes(label));
+    });
+    links.forEach((link) => {
+        const block = link.closest('.blockFilesTabDocs') || document;
+        link.dataset.parserExpandText = link.textContent;
+        link.dataset.parserExpandRows = block.querySelectorAll('.attachment.row').length;
+        link.click();
+    });
+    return links.length;
+}
+"""
+
+# Отработала каждая нажатая ссылка: исчезла, скрылась, сменила текст или
+# в ее блоке стало больше документов
+DOCUMENTS_EXPANDED_CONDITION = """
+() => Array.from(document.querySelectorAll('a[data-parser-expand-text]')).every((link) => {
+    const block = link.closest('.blockFilesTabDocs') || document;
+    return link.offsetParent === null
+        || link.textContent !== link.dataset.parserExpandText
+        || block.querySelectorAll('.attachment.row').length > Number(link.dataset.parserExpandRows);
+})
+"""
+
+# Раскрывает характеристики всех позиций текущей страницы,
+# возвращает id строк truInfo_*, по которым пришлось кликнуть
+EXPAND_CHARACTERISTICS_SCRIPT = """
+(container) => {
+    const clicked = [];
+    document.querySelectorAll(`${container} .chevronRight[onclick*='truInfo_']`).forEach((chevron) => {
+        const match = (chevron.getAttribute('onclick') || '').match(/'truInfo_(\\d+)'/);
+        if (!match) {
+            return;
+        }
+        if (!document.querySelector(`tr.truInfo_${match[1]} table.tableBlock`)) {
+            clicked.push(match[1]);
+            chevron.click();
+        }
+    });
+    return clicked;
+}
+"""
+
+# Таблицы характеристик появились у всех раскрытых скриптом позиций
+CHARACTERISTICS_LOADED_CONDITION = """
+(ids) => ids.every((id) => document.querySelector(`tr.truInfo_${id} table.tableBlock`))
+"""
+
+# Раскрывает строки medInfo* всех медицинских позиций, возвращает их id
+EXPAND_MEDICINE_SCRIPT = """
+(container) => {
+    document.querySelectorAll('.popupModalOverlay').forEach((overlay) => overlay.remove());
+    const ids = [];
+    document.querySelectorAll(`${container} svg[onclick*='medInfo']`).forEach((arrow) => {
+        const match = (arrow.getAttribute('onclick') || '').match(/'(medInfo\\d+_\\d+)'/);
+        if (!match) {
+            return;
+        }
+        ids.push(match[1]);
+        if (!document.querySelector(`tr.${match[1]}`)) {
+            // У svg нет метода click(), событие отправляем напрямую
+            arrow.dispatchEvent(new MouseEvent('click', { bubbles: true }));
+        }
+    });
+    return ids;
+}
+"""
+
+# Строки с вариантами поставки появились у всех медицинских позиций
+MEDICINE_LOADED_CONDITION = """
+(ids) => ids.every((id) => document.querySelector(`tr.${id}`))
+"""
+
+
 async def expand_collapse_blocks(page: Page):
     """Раскрытие всех свернутых блоков"""
+    if isinstance(page, HtmlSnapshot):
+        # Снимок снимается уже после раскрытия, кликать в нем нечего
+        return
+
     try:
-        collapse_titles = await page.query_selector_all(
-            "div.collapse__title:not(.collapse__title_opened)"
-        )
+        clicked = await page.evaluate(EXPAND_COLLAPSE_SCRIPT)
+        if not clicked:
+            return
+
+        logger.info(f"Найдено {clicked} свернутых блоков")
 
-        if collapse_titles:
-            logger.info(f"Найдено {len(collapse_titles)} свернутых блоков")
-
-        for i, title in enumerate(collapse_titles):
-            try:
-                await title.click()
-                await asyncio.sleep(0.5)
-                logger.debug(f"Раскрыт блок {i + 1}/{len(collapse_titles)}")
-            except Exception as e:
-                logger.warning(f"Не удалось раскрыть блок {i + 1}: {e}")
-                continue
+        if await wait_for_condition(
+            page,
+            COLLAPSE_OPENED_CONDITION,
+            label="collapse_blocks",
+            timeout=settings.expand_timeout,
+        ):
+            logger.debug(f"Раскрыто блоков: {clicked}")
+        else:
+            logger.warning("Не все блоки раскрылись за отведенное время")
     except Exception as e:
         logger.error(f"Ошибка при раскрытии блоков: {e}")
 
 
 async def expand_all_documents(page: Page):
     """Раскрывает все скрытые документы"""
+    if isinstance(page, HtmlSnapshot):
+        return
+
     try:
-        show_more_buttons = await page.query_selector_all(
-            "a:has-text('Показать больше'), a:has-text('Показать все')"
+        clicked = await page.evaluate(EXPAND_DOCUMENTS_SCRIPT)
+        if not clicked:
+            return
+
+        logger.debug(f"Нажато ссылок 'Показать больше': {clicked}")
+
+        await wait_for_condition(
+            page,
+            DOCUMENTS_EXPANDED_CONDITION,
+            label="documents",
+            timeout=settings.expand_timeout,
         )
+    except Exception as e:
+        logger.debug(f"Ошибка при раскрытии документов: {e}")
+
+
+async def expand_item_characteristics(
+    page: Page, container: str = "#positionKTRU"
+) -> Optional[HtmlSnapshot]:
+    """Раскрывает характеристики всех позиций страницы за один вызов
 
-        for button in show_more_buttons:
-            try:
-                await button.scroll_into_view_if_needed()
-                await asyncio.sleep(0.5)
-                await button.click()
-                await asyncio.sleep(0.5)
-            except:
-                continue
-    except:
-        pass
+    Возвращает снимок блока позиций со всеми таблицами характеристик или
+    None, если часть таблиц не загрузилась - тогда позиции раскрываются
+    по одной.
+    """
+    if isinstance(page, HtmlSnapshot):
+        return page
+
+    try:
+        ids = await page.evaluate(EXPAND_CHARACTERISTICS_SCRIPT, container)
+        if ids:
+            logger.debug(f"Раскрываем характеристики позиций: {len(ids)}")
+            if not await wait_for_condition(
+                page,
+                CHARACTERISTICS_LOADED_CONDITION,
+                label="characteristics_bulk",
+                arg=ids,
+                timeout=settings.expand_timeout,
+            ):
+                logger.warning("Не все характеристики загрузились, раскрываем по одной")
+                return None
+
+        html = await page.eval_on_selector(container, "(element) => element.outerHTML")
+        return HtmlSnapshot(html, url=page.url)
+    except Exception as e:
+        logger.error(f"Ошибка при раскрытии характеристик: {e}")
+        return None
+
+
+async def expand_medicine_info(
+    page: Page, container: str = "[id^='medTable']"
+) -> Optional[HtmlSnapshot]:
+    """Раскрывает строки medInfo* всех медицинских позиций за один вызов
+
+    Возвращает снимок медицинской таблицы с вариантами поставки и ЖНВЛП
+    или None, если часть строк не появилась - тогда позиции раскрываются
+    по одной.
+    """
+    if isinstance(page, HtmlSnapshot):
+        return page
+
+    try:
+        ids = await page.evaluate(EXPAND_MEDICINE_SCRIPT, container)
+        if ids:
+            logger.debug(f"Раскрываем медицинские позиции: {len(ids)}")
+            if not await wait_for_condition(
+                page,
+                MEDICINE_LOADED_CONDITION,
+                label="medicine_info_bulk",
+                arg=ids,
+                timeout=settings.expand_timeout,
+            ):
+                logger.warning("Не все медицинские позиции раскрылись, раскрываем по одной")
+                return None
+
+        html = await page.eval_on_selector(container, "(element) => element.outerHTML")
+        return HtmlSnapshot(html, url=page.url)
+    except Exception as e:
+        logger.error(f"Ошибка при раскрытии медицинских позиций: {e}")
+        return None
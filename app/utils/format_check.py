@@ -1,4 +1,6 @@
 import logging
+import re
+from typing import Optional
 
 from playwright.async_api import Page
 
@@ -37,3 +39,40 @@ def get_file_type(icon_src: str) -> str:
         return "archive"
     else:
         return "document"
+
+
+async def get_browser_requirement(page: Page) -> Optional[str]:
+    """Проверяет, нужен ли браузер для разбора страницы общей информации
+
+    Возвращает причину, если статического HTML недостаточно, иначе None.
+    """
+    # Страница не похожа на карточку тендера (ошибка, заглушка и т.п.)
+    if not await page.query_selector("span.cardMainInfo__purchaseLink"):
+        return "нет карточки тендера"
+
+    # Содержимое свернутых блоков подгружается скриптами
+    for content in await page.query_selector_all("div.collapse__content"):
+        if not await content.query_selector("*"):
+            return "пустые свернутые блоки"
+
+    # Медицинские позиции раскрываются только кликом
+    if await page.query_selector("[id^='medTable']"):
+        return "медицинские позиции"
+
+    # Характеристики позиций подгружаются кликом, если их нет в разметке
+    for chevron in await page.query_selector_all(
+        "#positionKTRU .chevronRight[onclick*='truInfo_']"
+    ):
+        match = re.search(r"'truInfo_(\d+)'", await chevron.get_attribute("onclick"))
+        if not match or not await page.query_selector(
+            f"tr.truInfo_{match.group(1)} table.tableBlock"
+        ):
+            return "характеристики позиций"
+
+    # Следующие страницы позиций загружаются скриптом
+    if await page.query_selector(
+        "div[id*='truPagingContainer'] .paginator li.page:not(.disabled) a.next"
+    ):
+        return "пагинация позиций"
+
+    return None
@@ -0,0 +1,162 @@
+import asyncio
+import base64
+import json
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from playwright.async_api import BrowserContext, Route
+
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Заголовки, которые не соответствуют уже раскодированному телу из HAR
+_SKIP_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class HarResponse:
+    """Записанный ответ: статус, заголовки и тело"""
+
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    @property
+    def aborted(self) -> bool:
+        # Запросы, отмененные при записи (блокировка картинок, счетчиков),
+        # Playwright сохраняет со статусом -1
+        return self.status < 100
+
+
+class HarReplay:
+    """Отдает ответы из HAR-файла вместо сети
+
+    Подключается к контексту Playwright и к HTTP-клиенту. Ответы ищутся по
+    методу, URL и телу запроса; повторные запросы получают записанные ответы
+    по порядку. Запросы, которых нет в записи, отклоняются.
+    """
+
+    def __init__(self, har_path: str, latency_ms: int = 0):
+        self.har_path = har_path
+        self.latency_ms = latency_ms
+        self.misses: List[str] = []
+        self._responses: Dict[Tuple, List[HarResponse]] = defaultdict(list)
+        self._served: Dict[Tuple, int] = defaultdict(int)
+        self._load()
+
+    def _load(self):
+        with open(self.har_path, encoding="utf-8") as f:
+            har = json.load(f)
+
+        for entry in har["log"]["entries"]:
+            request = entry["request"]
+            response = entry["response"]
+            content = response.get("content", {})
+            text = content.get("text") or ""
+            body = (
+                base64.b64decode(text)
+                if content.get("encoding") == "base64"
+                else text.encode("utf-8")
+            )
+            headers = {
+                header["name"]: header["value"]
+                for header in response.get("headers", [])
+                if header["name"].lower() not in _SKIP_HEADERS
+            }
+            key = self._key(
+                request["method"], request["url"], (request.get("postData") or {}).get("text")
+            )
+            self._responses[key].append(HarResponse(response["status"], headers, body))
+
+        logger.info(
+            f"Загружена запись {self.har_path}: {sum(map(len, self._responses.values()))} ответов"
+        )
+
+    @staticmethod
+    def _key(method: str, url: str, body: Optional[str]) -> Tuple:
+        return method.upper(), url.split("#", 1)[0], body or None
+
+    async def lookup(self, method: str, url: str, body: Optional[str]) -> Optional[HarResponse]:
+        """Следующий записанный ответ на запрос или None"""
+        key = self._key(method, url, body)
+        responses = self._responses.get(key)
+        if not responses:
+            self.misses.append(f"{method} {url}")
+            logger.debug(f"Нет записанного ответа: {method} {url}")
+            return None
+
+        # Повторы отдаются по порядку, последний ответ - для всех лишних запросов
+        index = min(self._served[key], len(responses) - 1)
+        self._served[key] += 1
+
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        return responses[index]
+
+    async def handle_route(self, route: Route):
+        """Обработчик маршрутов Playwright"""
+        request = route.request
+        try:
+            response = await self.lookup(request.method, request.url, request.post_data)
+            if response is None:
+                await route.abort("internetdisconnected")
+                return
+            if response.aborted:
+                await route.abort("blockedbyclient")
+                return
+            await route.fulfill(
+                status=response.status, headers=response.headers, body=response.body
+            )
+        except Exception as e:
+            logger.debug(f"Ошибка воспроизведения {request.url}: {e}")
+            # Запрос не должен остаться без ответа, иначе страница не дождется load
+            try:
+                await route.abort()
+            except Exception:
+                pass
+
+    async def install(self, context: BrowserContext):
+        """Подключает воспроизведение ко всем запросам контекста"""
+        await context.route("**/*", self.handle_route)
+
+    def transport(self) -> httpx.AsyncBaseTransport:
+        """Транспорт для httpx, отдающий ответы из записи"""
+        return _HarTransport(self)
+
+    def reset(self):
+        """Начать воспроизведение сначала"""
+        self._served.clear()
+        self.misses.clear()
+
+
+class _HarTransport(httpx.AsyncBaseTransport):
+    def __init__(self, replay: HarReplay):
+        self._replay = replay
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = (await request.aread()).decode("utf-8", errors="replace") or None
+        response = await self._replay.lookup(request.method, str(request.url), body)
+        if response is None:
+            raise httpx.ConnectError(f"Нет записанного ответа: {request.url}", request=request)
+        if response.aborted:
+            raise httpx.ConnectError(f"Запрос отменен при записи: {request.url}", request=request)
+        return httpx.Response(
+            response.status, headers=response.headers, content=response.body, request=request
+        )
+
+
+_replay: Optional[HarReplay] = None
+
+
+def get_har_replay() -> Optional[HarReplay]:
+    """Воспроизведение из settings.har_replay_path или None, если оно выключено"""
+    global _replay
+    if not settings.har_replay_path:
+        return None
+    if _replay is None or _replay.har_path != settings.har_replay_path:
+        _replay = HarReplay(settings.har_replay_path, latency_ms=settings.replay_latency_ms)
+    _replay.latency_ms = settings.replay_latency_ms
+    return _replay
@@ -0,0 +1,94 @@
+import logging
+from functools import lru_cache
+from typing import List, Optional
+
+from cssselect import HTMLTranslator
+from cssselect.xpath import ExpressionError
+from lxml import html as lxml_html
+from playwright.async_api import Page
+
+logger = logging.getLogger(__name__)
+
+_UPPER = "ABCDEFGHIJKLMNOPQRSTUVWXYZАБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ"
+_LOWER = "abcdefghijklmnopqrstuvwxyzабвгдеёжзийклмнопрстуфхцчшщъыьэюя"
+
+
+class PlaywrightTranslator(HTMLTranslator):
+    """CSS -> XPath с поддержкой текстовых псевдоклассов Playwright"""
+
+    def _text_condition(self, function) -> str:
+        if function.argument_types() not in (["STRING"], ["IDENT"]):
+            raise ExpressionError(
+                f"Ожидалась строка в :{function.name}(), получено {function.arguments!r}"
+            )
+        value = " ".join(function.arguments[0].value.split()).lower()
+        # Как в Playwright: без учета регистра и с нормализацией пробелов
+        return (
+            f"contains(translate(normalize-space(string(.)), '{_UPPER}', '{_LOWER}'), "
+            f"{self.xpath_literal(value)})"
+        )
+
+    def xpath_has_text_function(self, xpath, function):
+        return xpath.add_condition(self._text_condition(function))
+
+    def xpath_text_function(self, xpath, function):
+        # :text() выбирает самый вложенный элемент, содержащий текст
+        condition = self._text_condition(function)
+        return xpath.add_condition(f"{condition} and not(*[{condition}])")
+
+
+_translator = PlaywrightTranslator()
+
+
+@lru_cache(maxsize=512)
+def css_to_xpath(selector: str, prefix: str = "descendant-or-self::") -> str:
+    """Перевод селектора в XPath с кешированием"""
+    return _translator.css_to_xpath(selector, prefix=prefix)
+
+
+class SnapshotElement:
+    """Элемент снимка страницы с интерфейсом ElementHandle"""
+
+    def __init__(self, element):
+        self._element = element
+
+    async def query_selector(self, selector: str) -> Optional["SnapshotElement"]:
+        found = self._element.xpath(css_to_xpath(selector, "descendant::"))
+        return SnapshotElement(found[0]) if found else None
+
+    async def query_selector_all(self, selector: str) -> List["SnapshotElement"]:
+        found = self._element.xpath(css_to_xpath(selector, "descendant::"))
+        return [SnapshotElement(element) for element in found]
+
+    async def text_content(self) -> str:
+        return self._element.text_content()
+
+    async def get_attribute(self, name: str) -> Optional[str]:
+        return self._element.get(name)
+
+
+class HtmlSnapshot:
+    """Снимок HTML страницы с интерфейсом Page для разбора без браузера"""
+
+    def __init__(self, html: str, url: str = None):
+        self.url = url
+        self._html = html
+        self.document = lxml_html.document_fromstring(html)
+
+    @classmethod
+    async def from_page(cls, page: Page) -> "HtmlSnapshot":
+        """Снимок текущего состояния DOM за одно обращение к браузеру"""
+        html = await page.content()
+        logger.debug(f"Снят HTML страницы: {len(html)} символов")
+        return cls(html, url=page.url)
+
+    async def content(self) -> str:
+        return self._html
+
+    async def query_selector(self, selector: str) -> Optional[SnapshotElement]:
+        found = self.document.xpath(css_to_xpath(selector))
+        return SnapshotElement(found[0]) if found else None
+
+    async def query_selector_all(self, selector: str) -> List[SnapshotElement]:
+        found = self.document.xpath(css_to_xpath(selector))
+        return [SnapshotElement(element) for element in found]
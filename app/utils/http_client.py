@@ -0,0 +1,88 @@
+import asyncio
+import logging
+from typing import Optional
+
+import httpx
+
+from app.core.settings import settings
+from app.utils.browser_pool import CONTEXT_OPTIONS
+from app.utils.har_replay import get_har_replay
+from app.utils.metrics import FAST_PATH_RESULTS
+
+logger = logging.getLogger(__name__)
+
+
+class HttpClient:
+    """Общий пул HTTP-соединений для загрузки страниц без браузера"""
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._lock = asyncio.Lock()
+
+    async def start(self):
+        """Создание клиента с пулом соединений"""
+        async with self._lock:
+            if self._client is None:
+                self._client = self._create_client()
+
+    async def stop(self):
+        """Закрытие всех соединений"""
+        async with self._lock:
+            if self._client is not None:
+                await self._client.aclose()
+                self._client = None
+
+    async def get_text(self, url: str) -> str:
+        """GET-запрос, возвращает тело ответа; ошибки статуса пробрасываются"""
+        if self._client is None:
+            # Клиент создается лениво, если приложение его не запустило
+            await self.start()
+
+        response = await self._client.get(url)
+        response.raise_for_status()
+        return response.text
+
+    @staticmethod
+    def _create_client() -> httpx.AsyncClient:
+        headers = {
+            "User-Agent": CONTEXT_OPTIONS["user_agent"],
+            "Accept": CONTEXT_OPTIONS["extra_http_headers"]["Accept"],
+            "Accept-Language": CONTEXT_OPTIONS["extra_http_headers"]["Accept-Language"],
+        }
+        replay = get_har_replay()
+        return httpx.AsyncClient(
+            headers=headers,
+            transport=replay.transport() if replay is not None else None,
+            timeout=settings.http_timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_connections,
+            ),
+        )
+
+
+class FastPathStats:
+    """Счетчики быстрого пути: сколько раз хватило HTTP и сколько раз нужен браузер
+
+    Значения также отдаются в /metrics как tender_parser_fast_path_total.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.hits = 0
+        self.fallbacks = 0
+
+    def hit(self):
+        self.hits += 1
+        FAST_PATH_RESULTS.labels(self.name, "hit").inc()
+
+    def fallback(self, reason: str):
+        self.fallbacks += 1
+        FAST_PATH_RESULTS.labels(self.name, "fallback").inc()
+        logger.info(
+            f"Быстрый путь '{self.name}' не сработал ({reason}), используем браузер. "
+            f"Всего откатов: {self.fallbacks} из {self.hits + self.fallbacks}"
+        )
+
+http_client = HttpClient()
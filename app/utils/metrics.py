@@ -0,0 +1,122 @@
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, TypeVar
+
+from prometheus_client import Counter, Histogram
+
+from app.utils.tender_trace import current_trace
+
+T = TypeVar("T")
+
+# Этапы длятся от миллисекунд (разбор снимка) до минут (позиции с пагинацией)
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+STAGE_SECONDS = Histogram(
+    "tender_parser_stage_seconds",
+    "Длительность этапа парсинга",
+    ["stage"],
+    buckets=STAGE_BUCKETS,
+)
+STAGE_RESULTS = Counter(
+    "tender_parser_stage_results_total",
+    "Результаты этапов парсинга: success, empty (ничего не найдено) или failure",
+    ["stage", "status"],
+)
+WAIT_SECONDS = Histogram(
+    "tender_parser_wait_seconds",
+    "Ожидания на странице: пагинация, раскрытие характеристик, блоков и т.п.",
+    ["label"],
+    buckets=STAGE_BUCKETS,
+)
+WAIT_TIMEOUTS = Counter(
+    "tender_parser_wait_timeouts_total",
+    "Ожидания, завершившиеся по таймауту",
+    ["label"],
+)
+FAST_PATH_RESULTS = Counter(
+    "tender_parser_fast_path_total",
+    "Быстрый путь без браузера: hit (хватило HTTP) или fallback (нужен браузер)",
+    ["path", "result"],
+)
+BROWSER_CALLS = Counter(
+    "tender_parser_browser_calls_total",
+    "Вызовы Playwright по месту вызова (при browser_call_tracking)",
+    ["site", "method"],
+)
+BROWSER_CALL_SECONDS = Counter(
+    "tender_parser_browser_call_seconds_total",
+    "Суммарное время вызовов Playwright по месту вызова (при browser_call_tracking)",
+    ["site", "method"],
+)
+PAGINATION_PAGES = Histogram(
+    "tender_parser_pagination_pages",
+    "Страниц позиций, разобранных за тендер (включая пустые и повторные)",
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100),
+)
+
+
+def _status(result) -> str:
+    return "empty" if result is None or result == "" else "success"
+
+
+def record_stage(stage: str, seconds: float, status: str):
+    STAGE_SECONDS.labels(stage).observe(seconds)
+    STAGE_RESULTS.labels(stage, status).inc()
+    trace = current_trace()
+    if trace is not None:
+        trace.add_stage(stage, seconds)
+
+
+async def observe_stage(stage: str, awaitable: Awaitable[T]) -> T:
+    """Выполняет этап и записывает его длительность и результат"""
+    started = time.perf_counter()
+    try:
+        result = await awaitable
+    except Exception:
+        record_stage(stage, time.perf_counter() - started, "failure")
+        raise
+    record_stage(stage, time.perf_counter() - started, _status(result))
+    return result
+
+
+@asynccontextmanager
+async def track_stage(stage: str):
+    """Замер этапа, не возвращающего значение"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        record_stage(stage, time.perf_counter() - started, "failure")
+        raise
+    record_stage(stage, time.perf_counter() - started, "success")
+
+
+async def observe_iteration(stage: str, iterator: AsyncIterator[T]) -> AsyncIterator[T]:
+    """Замер этапа, отдающего данные порциями
+
+    Учитывается только время получения порций, а не время их обработки
+    потребителем (например, отправки клиенту).
+    """
+    elapsed = 0.0
+    received = 0
+    while True:
+        started = time.perf_counter()
+        try:
+            item = await iterator.__anext__()
+        except StopAsyncIteration:
+            elapsed += time.perf_counter() - started
+            break
+        except Exception:
+            record_stage(stage, elapsed + time.perf_counter() - started, "failure")
+            raise
+        elapsed += time.perf_counter() - started
+        received += 1
+        yield item
+
+    record_stage(stage, elapsed, "success" if received else "empty")
+
+
+def record_wait(label: str, seconds: float, timed_out: bool):
+    WAIT_SECONDS.labels(label).observe(seconds)
+    if timed_out:
+        WAIT_TIMEOUTS.labels(label).inc()
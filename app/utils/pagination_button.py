@@ -1,17 +1,136 @@
-import asyncio
+from typing import Awaitable, Callable, Optional
 
 from playwright.async_api import Page
 import logging
 
+from app.core.settings import settings
+from app.utils.html_snapshot import HtmlSnapshot
+from app.utils.waiting import wait_for_condition, wait_for_xhr
+
 logger = logging.getLogger(__name__)
 
+PAGINATOR_SELECTOR = "div[id*='truPagingContainer'] .paginator"
+
+# Номер последней страницы по ссылкам пагинатора
+PAGE_COUNT_SCRIPT = """
+(selector) => {
+    const paginator = document.querySelector(selector);
+    if (!paginator) {
+        return 1;
+    }
+    const numbers = Array.from(paginator.querySelectorAll('a'))
+        .map((link) => parseInt(link.dataset.pagenumber || link.textContent.trim(), 10))
+        .filter((number) => !isNaN(number));
+    return numbers.length ? Math.max(...numbers) : 1;
+}
+"""
+
+# Помечает ссылку на ближайшую к цели страницу в диапазоне (current, target]
+MARK_PAGE_LINK_SCRIPT = """
+([selector, current, target]) => {
+    const paginator = document.querySelector(selector);
+    if (!paginator) {
+        return null;
+    }
+    paginator.querySelectorAll('[data-parser-page-link]').forEach((link) => {
+        delete link.dataset.parserPageLink;
+    });
+    let best = null;
+    let bestNumber = null;
+    paginator.querySelectorAll('a').forEach((link) => {
+        const number = parseInt(link.dataset.pagenumber || link.textContent.trim(), 10);
+        if (!isNaN(number) && number > current && number <= target
+                && (bestNumber === null || number > bestNumber)) {
+            best = link;
+            bestNumber = number;
+        }
+    });
+    if (best) {
+        best.dataset.parserPageLink = '1';
+    }
+    return bestNumber;
+}
+"""
+
+# Номер активной страницы пагинатора и подпись первой строки позиций
+_PAGE_STATE_FUNCTION = """
+    const pageState = (paginatorSelector, rowSelector) => {
+        const paginator = document.querySelector(paginatorSelector);
+        const activeElement = paginator
+            ? paginator.querySelector('.active, .current, .selected')
+            : null;
+        const active = activeElement
+            ? parseInt(activeElement.dataset.pagenumber || activeElement.textContent.trim(), 10)
+            : NaN;
+        const row = document.querySelector(rowSelector);
+        let firstRow = null;
+        if (row) {
+            const chevron = row.querySelector("[onclick*='truInfo_']");
+            firstRow = chevron ? chevron.getAttribute('onclick') : row.textContent.trim();
+        }
+        return { active: isNaN(active) ? null : active, firstRow };
+    };
+"""
+
+PAGE_STATE_SCRIPT = (
+    "([paginatorSelector, rowSelector]) => {"
+    + _PAGE_STATE_FUNCTION
+    + """
+    return pageState(paginatorSelector, rowSelector);
+}
+"""
+)
+
+# Страница сменилась: первая строка другая. Активная страница пагинатора
+# переключается раньше, чем приходят строки, поэтому учитывается, только если
+# строк до перехода не было
+PAGE_CHANGED_CONDITION = (
+    "([paginatorSelector, rowSelector, before, target]) => {"
+    + _PAGE_STATE_FUNCTION
+    + """
+    const { active, firstRow } = pageState(paginatorSelector, rowSelector);
+    if (firstRow !== null && firstRow !== before.firstRow) {
+        return true;
+    }
+    if (before.firstRow !== null || active === null) {
+        return false;
+    }
+    return target !== null
+        ? active === target
+        : before.active !== null && active !== before.active;
+}
+"""
+)
+
+FIRST_ROW_SELECTOR = "#positionKTRU table.tableBlock tbody.tableBlock__body > tr.tableBlock__row"
+
+
+async def click_and_wait_page(
+    page: Page, click: Callable[[], Awaitable], target: Optional[int] = None
+) -> bool:
+    """Кликает по пагинатору и ждет, пока строки позиций сменятся
+
+    Сигнал завершения - ответ на XHR пагинации, после него проверяется, что
+    на странице действительно другие строки. Возвращает False, если страница
+    не сменилась.
+    """
+    before = await page.evaluate(PAGE_STATE_SCRIPT, [PAGINATOR_SELECTOR, FIRST_ROW_SELECTOR])
+
+    async with wait_for_xhr(page, settings.pagination_xhr_pattern, label="pagination_xhr"):
+        await click()
+
+    return await wait_for_condition(
+        page,
+        PAGE_CHANGED_CONDITION,
+        label="pagination",
+        arg=[PAGINATOR_SELECTOR, FIRST_ROW_SELECTOR, before, target],
+    )
+
 
 async def go_to_next_page(page: Page) -> bool:
     """Переходит на следующую страницу"""
     try:
-        paginator = await page.query_selector(
-            "div[id*='truPagingContainer'] .paginator"
-        )
+        paginator = await page.query_selector(PAGINATOR_SELECTOR)
         if not paginator:
             return False
 
@@ -21,9 +140,11 @@ async def go_to_next_page(page: Page) -> bool:
             return False
 
         await paginator.scroll_into_view_if_needed()
-        await asyncio.sleep(0.5)
-        await next_button.click()
-        await asyncio.sleep(1)
+
+        # Ждем, пока в таблице позиций появятся строки следующей страницы
+        if not await click_and_wait_page(page, next_button.click):
+            logger.warning("Строки позиций не сменились после перехода на следующую страницу")
+            return False
 
         logger.info("Перешли на следующую страницу")
         return True
@@ -31,3 +152,48 @@ async def go_to_next_page(page: Page) -> bool:
     except Exception as e:
         logger.error(f"Ошибка при переходе на следующую страницу: {e}")
         return False
+
+
+async def get_page_count(page: Page) -> int:
+    """Количество страниц позиций по пагинатору"""
+    if isinstance(page, HtmlSnapshot):
+        # В статическом HTML доступна только первая страница
+        return 1
+
+    try:
+        return await page.evaluate(PAGE_COUNT_SCRIPT, PAGINATOR_SELECTOR)
+    except Exception as e:
+        logger.error(f"Ошибка при определении количества страниц: {e}")
+        return 1
+
+
+async def go_to_page(page: Page, target: int, current: int = 1) -> bool:
+    """Переходит со страницы current на страницу target
+
+    Кликает ссылку с самым близким к цели номером; если таких ссылок нет,
+    переходит на следующую страницу.
+    """
+    try:
+        while current < target:
+            number = await page.evaluate(
+                MARK_PAGE_LINK_SCRIPT, [PAGINATOR_SELECTOR, current, target]
+            )
+            if number is None:
+                if not await go_to_next_page(page):
+                    return False
+                current += 1
+                continue
+
+            if not await click_and_wait_page(
+                page, lambda: page.click("[data-parser-page-link]"), target=number
+            ):
+                logger.warning(f"Строки позиций не сменились после перехода на страницу {number}")
+                return False
+            current = number
+
+        logger.info(f"Перешли на страницу {target}")
+        return True
+
+    except Exception as e:
+        logger.error(f"Ошибка при переходе на страницу {target}: {e}")
+        return False
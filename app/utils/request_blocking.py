@@ -0,0 +1,117 @@
+import logging
+import re
+from typing import Dict, List, Optional
+from weakref import WeakKeyDictionary
+
+from playwright.async_api import BrowserContext, Route
+
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class BlockingStats:
+    """Заблокированные запросы и оценка сэкономленного трафика"""
+
+    def __init__(self):
+        self.blocked = 0
+        self.allowed = 0
+        self.bytes_saved = 0
+        self.by_type: Dict[str, int] = {}
+
+    def record_blocked(self, resource_type: str):
+        self.blocked += 1
+        self.bytes_saved += settings.blocked_size_estimates.get(
+            resource_type, settings.blocked_size_estimates.get("other", 0)
+        )
+        self.by_type[resource_type] = self.by_type.get(resource_type, 0) + 1
+
+    def record_allowed(self):
+        self.allowed += 1
+
+    def summary(self) -> str:
+        types = ", ".join(
+            f"{resource_type}: {count}"
+            for resource_type, count in sorted(self.by_type.items(), key=lambda item: -item[1])
+        )
+        details = f" ({types})" if types else ""
+        return (
+            f"заблокировано {self.blocked} из {self.blocked + self.allowed} запросов{details}, "
+            f"сэкономлено ~{self.bytes_saved / 1024:.0f} КБ"
+        )
+
+
+# Статистика за все время работы процесса
+blocking_stats = BlockingStats()
+
+
+class RequestBlocker:
+    """Перехват запросов контекста: отменяет лишние ресурсы по типу и URL"""
+
+    def __init__(
+        self,
+        resource_types: List[str] = None,
+        blocked_patterns: List[str] = None,
+        allowed_patterns: List[str] = None,
+    ):
+        self.resource_types = set(
+            settings.blocked_resource_types if resource_types is None else resource_types
+        )
+        self.blocked_patterns = [
+            re.compile(pattern)
+            for pattern in (
+                settings.blocked_url_patterns if blocked_patterns is None else blocked_patterns
+            )
+        ]
+        self.allowed_patterns = [
+            re.compile(pattern)
+            for pattern in (
+                settings.allowed_url_patterns if allowed_patterns is None else allowed_patterns
+            )
+        ]
+        # Статистика с последнего reset(), то есть за текущий запрос к API
+        self.stats = BlockingStats()
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if any(pattern.search(url) for pattern in self.allowed_patterns):
+            return False
+        if resource_type in self.resource_types:
+            return True
+        return any(pattern.search(url) for pattern in self.blocked_patterns)
+
+    async def handle(self, route: Route):
+        request = route.request
+        try:
+            if self.should_block(request.resource_type, request.url):
+                self.stats.record_blocked(request.resource_type)
+                blocking_stats.record_blocked(request.resource_type)
+                await route.abort("blockedbyclient")
+            else:
+                self.stats.record_allowed()
+                blocking_stats.record_allowed()
+                await route.continue_()
+        except Exception as e:
+            # Страница или контекст закрылись, пока запрос ждал решения
+            logger.debug(f"Ошибка перехвата запроса {request.url}: {e}")
+
+    def reset(self):
+        self.stats = BlockingStats()
+
+
+_blockers: "WeakKeyDictionary[BrowserContext, RequestBlocker]" = WeakKeyDictionary()
+
+
+async def install_request_blocking(context: BrowserContext) -> Optional[RequestBlocker]:
+    """Включает перехват запросов в контексте, если он разрешен настройками"""
+    if not settings.block_requests:
+        return None
+
+    blocker = RequestBlocker()
+    await context.route("**/*", blocker.handle)
+    _blockers[context] = blocker
+    return blocker
+
+
+def get_request_blocker(context: BrowserContext) -> Optional[RequestBlocker]:
+    """Перехватчик контекста или None, если блокировка выключена"""
+    return _blockers.get(context)
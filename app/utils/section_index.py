@@ -0,0 +1,177 @@
+import logging
+from typing import Callable, Dict, Iterable, List, Optional
+
+from playwright.async_api import Page
+
+from app.utils.html_snapshot import HtmlSnapshot, css_to_xpath
+
+logger = logging.getLogger(__name__)
+
+
+# Один проход по DOM: все секции и заголовки h2 в порядке документа
+COLLECT_SECTIONS_SCRIPT = """
+() => {
+    const inCollapse = (el) => el.closest('div.collapse__content') !== null;
+    const sections = Array.from(
+        document.querySelectorAll('section.blockInfo__section')
+    ).map((section) => {
+        const title = section.querySelector('span.section__title');
+        return {
+            title: title ? title.textContent : '',
+            infos: Array.from(section.querySelectorAll('span.section__info'))
+                .map((info) => info.textContent),
+            text: section.textContent,
+            inCollapse: inCollapse(section),
+        };
+    });
+    const headings = Array.from(document.querySelectorAll('h2')).map((h) => ({
+        text: h.textContent,
+        inCollapse: inCollapse(h),
+    }));
+    return { sections, headings };
+}
+"""
+
+
+def normalize_title(text: str) -> str:
+    """Нормализация заголовка: пробелы и регистр как в :has-text()"""
+    return " ".join((text or "").split()).lower()
+
+
+class Section:
+    """Секция блока информации: заголовок и значения"""
+
+    def __init__(
+        self, position: int, title: str, infos: List[str], text: str, in_collapse: bool
+    ):
+        self.position = position
+        self.title = title
+        self.key = normalize_title(title)
+        self.infos = infos
+        self.text = text
+        self.in_collapse = in_collapse
+
+    @property
+    def info(self) -> Optional[str]:
+        """Текст первого span.section__info, как у section.query_selector"""
+        return self.infos[0] if self.infos else None
+
+
+class SectionIndex:
+    """Индекс заголовок секции -> значение, строится один раз на страницу"""
+
+    def __init__(self, sections: List[Section], headings: List[tuple]):
+        self._sections = sections
+        self._headings = headings
+        self._by_key: Dict[str, List[Section]] = {}
+        for section in sections:
+            self._by_key.setdefault(section.key, []).append(section)
+
+    @classmethod
+    async def build(cls, page: Page) -> "SectionIndex":
+        """Строит индекс за одно обращение к странице (или по снимку HTML)"""
+        if isinstance(page, HtmlSnapshot):
+            index = cls._from_snapshot(page)
+        else:
+            data = await page.evaluate(COLLECT_SECTIONS_SCRIPT)
+            index = cls._from_data(data)
+
+        logger.debug(f"Построен индекс секций: {len(index._sections)}")
+        return index
+
+    @classmethod
+    def _from_data(cls, data: dict) -> "SectionIndex":
+        sections = [
+            Section(
+                position,
+                item["title"] or "",
+                item["infos"],
+                item["text"] or "",
+                item["inCollapse"],
+            )
+            for position, item in enumerate(data["sections"])
+        ]
+        headings = [
+            (normalize_title(item["text"]), item["inCollapse"])
+            for item in data["headings"]
+        ]
+        return cls(sections, headings)
+
+    @classmethod
+    def _from_snapshot(cls, snapshot: HtmlSnapshot) -> "SectionIndex":
+        def in_collapse(element) -> bool:
+            return bool(element.xpath(css_to_xpath("div.collapse__content", "ancestor::")))
+
+        sections = []
+        for section in snapshot.document.xpath(css_to_xpath("section.blockInfo__section")):
+            titles = section.xpath(css_to_xpath("span.section__title", "descendant::"))
+            infos = section.xpath(css_to_xpath("span.section__info", "descendant::"))
+            sections.append({
+                "title": titles[0].text_content() if titles else "",
+                "infos": [info.text_content() for info in infos],
+                "text": section.text_content(),
+                "inCollapse": in_collapse(section),
+            })
+
+        headings = [
+            {"text": heading.text_content(), "inCollapse": in_collapse(heading)}
+            for heading in snapshot.document.xpath(css_to_xpath("h2"))
+        ]
+        return cls._from_data({"sections": sections, "headings": headings})
+
+    def sections(self, collapsed_only: bool = False) -> List[Section]:
+        """Секции в порядке документа, при необходимости только из collapse-блоков"""
+        if not collapsed_only:
+            return self._sections
+        return [section for section in self._sections if section.in_collapse]
+
+    def exact(self, title: str, collapsed_only: bool = False) -> List[Section]:
+        """Секции с заголовком, совпадающим целиком"""
+        found = self._by_key.get(normalize_title(title), [])
+        if collapsed_only:
+            return [section for section in found if section.in_collapse]
+        return found
+
+    def find(
+        self,
+        *titles: str,
+        exclude: Iterable[str] = (),
+        collapsed_only: bool = False,
+    ) -> Optional[Section]:
+        """Первая секция, заголовок которой содержит любую из подстрок"""
+        return self.find_where(
+            _title_matcher(titles, exclude), collapsed_only=collapsed_only
+        )
+
+    def find_where(
+        self, predicate: Callable[[Section], bool], collapsed_only: bool = False
+    ) -> Optional[Section]:
+        for section in self.sections(collapsed_only):
+            if predicate(section):
+                return section
+        return None
+
+    def info(self, *titles: str, collapsed_only: bool = False) -> Optional[str]:
+        """Значение первой секции с подходящим заголовком"""
+        section = self.find(*titles, collapsed_only=collapsed_only)
+        return section.info if section else None
+
+    def has_heading(self, text: str, collapsed_only: bool = False) -> bool:
+        """Есть ли заголовок h2, содержащий текст"""
+        needle = normalize_title(text)
+        return any(
+            needle in heading and (in_collapse or not collapsed_only)
+            for heading, in_collapse in self._headings
+        )
+
+
+def _title_matcher(titles: Iterable[str], exclude: Iterable[str]):
+    needles = [normalize_title(title) for title in titles]
+    excluded = [normalize_title(title) for title in exclude]
+
+    def matches(section: Section) -> bool:
+        return any(needle in section.key for needle in needles) and not any(
+            word in section.key for word in excluded
+        )
+
+    return matches
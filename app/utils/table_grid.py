@@ -0,0 +1,91 @@
+import logging
+from typing import Dict, List, Sequence, Tuple
+
+from app.utils.html_snapshot import SnapshotElement
+
+logger = logging.getLogger(__name__)
+
+# Ячейка таблицы до раскрытия объединений: текст, rowspan, colspan
+RawCell = Tuple[str, int, int]
+
+# Таблица в виде плотной матрицы строк: объединенные ячейки повторены в
+# каждой строке/колонке, которые они занимают
+TABLE_GRID_SCRIPT = """
+(table, rowSelector) => {
+    const rows = Array.from(table.querySelectorAll(rowSelector));
+    const occupied = new Map();
+    let width = 0;
+    rows.forEach((row, r) => {
+        let c = 0;
+        row.querySelectorAll('td').forEach((cell) => {
+            while (occupied.has(`${r}:${c}`)) {
+                c += 1;
+            }
+            const text = cell.textContent.trim();
+            const rowspan = Math.max(parseInt(cell.getAttribute('rowspan'), 10) || 1, 1);
+            const colspan = Math.max(parseInt(cell.getAttribute('colspan'), 10) || 1, 1);
+            for (let dr = 0; dr < rowspan && r + dr < rows.length; dr++) {
+                for (let dc = 0; dc < colspan; dc++) {
+                    occupied.set(`${r + dr}:${c + dc}`, text);
+                }
+            }
+            c += colspan;
+            width = Math.max(width, c);
+        });
+    });
+    return rows.map((row, r) =>
+        Array.from({ length: width }, (_, c) => occupied.get(`${r}:${c}`) || '')
+    );
+}
+"""
+
+
+def _span(value) -> int:
+    try:
+        return max(int(value), 1)
+    except (TypeError, ValueError):
+        return 1
+
+
+def build_grid(rows: Sequence[Sequence[RawCell]]) -> List[List[str]]:
+    """Раскрывает rowspan/colspan и возвращает плотную матрицу строк"""
+    occupied: Dict[Tuple[int, int], str] = {}
+    width = 0
+
+    for r, cells in enumerate(rows):
+        c = 0
+        for text, rowspan, colspan in cells:
+            while (r, c) in occupied:
+                c += 1
+            for dr in range(min(rowspan, len(rows) - r)):
+                for dc in range(colspan):
+                    occupied[(r + dr, c + dc)] = text
+            c += colspan
+            width = max(width, c)
+
+    return [[occupied.get((r, c), "") for c in range(width)] for r in range(len(rows))]
+
+
+async def extract_table_grid(table, row_selector: str = "tr") -> List[List[str]]:
+    """Таблица в виде плотной матрицы строк
+
+    Для живой страницы - один вызов в браузере, для снимка HTML - разбор
+    без браузера тем же алгоритмом.
+    """
+    if not isinstance(table, SnapshotElement):
+        return await table.evaluate(TABLE_GRID_SCRIPT, row_selector)
+
+    rows = []
+    for row in await table.query_selector_all(row_selector):
+        cells = []
+        for cell in await row.query_selector_all("td"):
+            text = await cell.text_content()
+            cells.append(
+                (
+                    text.strip(),
+                    _span(await cell.get_attribute("rowspan")),
+                    _span(await cell.get_attribute("colspan")),
+                )
+            )
+        rows.append(cells)
+    return build_grid(rows)
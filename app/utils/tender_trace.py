@@ -0,0 +1,90 @@
+import copy
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from app.schemas.meta import ParseMeta, StageTiming
+
+# Ожидания, которые показываются отдельными этапами: метка ожидания -> этап
+WAIT_STAGES = {
+    "pagination": "pagination",
+    "pagination_xhr": "pagination",
+    "characteristics": "characteristics",
+    "characteristics_bulk": "characteristics",
+    "medicine_info": "characteristics",
+    "medicine_info_bulk": "characteristics",
+}
+
+
+class TenderTrace:
+    """Время этапов и счетчики парсинга одного тендера
+
+    Этапы, выполняющиеся параллельно (документы, вкладки пагинации),
+    суммируются, поэтому сумма этапов может превышать общее время.
+    """
+
+    def __init__(self, source: str = "parse"):
+        self.source = source
+        self.started = time.perf_counter()
+        # этап -> [секунды, количество]; порядок - порядок первого выполнения
+        self.stages: Dict[str, list] = {}
+        self.counts: Dict[str, int] = {}
+
+    def add_stage(self, stage: str, seconds: float):
+        timing = self.stages.setdefault(stage, [0.0, 0])
+        timing[0] += seconds
+        timing[1] += 1
+
+    def count(self, name: str, value: int = 1):
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    def add_waits(self, waits):
+        """Переносит ожидания пагинации и раскрытия характеристик из WaitStats"""
+        for label, stats in waits.by_label.items():
+            stage = WAIT_STAGES.get(label)
+            if stage is None:
+                continue
+            timing = self.stages.setdefault(stage, [0.0, 0])
+            timing[0] += stats["total"]
+            timing[1] += int(stats["count"])
+
+    def with_source(self, source: str) -> "TenderTrace":
+        trace = copy.copy(self)
+        trace.source = source
+        return trace
+
+    def server_timing(self, total: float) -> str:
+        """Значение заголовка Server-Timing"""
+        entries = [
+            f"{stage};dur={seconds * 1000:.1f}"
+            for stage, (seconds, _) in self.stages.items()
+        ]
+        entries.append(f'total;dur={total * 1000:.1f};desc="{self.source}"')
+        return ", ".join(entries)
+
+    def to_meta(self, total: float) -> ParseMeta:
+        return ParseMeta(
+            source=self.source,
+            totalMs=round(total * 1000, 1),
+            stages={
+                stage: StageTiming(ms=round(seconds * 1000, 1), count=count)
+                for stage, (seconds, count) in self.stages.items()
+            },
+            counts=dict(self.counts),
+        )
+
+
+_current_trace: ContextVar[Optional[TenderTrace]] = ContextVar(
+    "current_tender_trace", default=None
+)
+
+
+def start_trace() -> TenderTrace:
+    """Начинает сбор этапов для текущей задачи (одного тендера)"""
+    trace = TenderTrace()
+    _current_trace.set(trace)
+    return trace
+
+
+def current_trace() -> Optional[TenderTrace]:
+    return _current_trace.get()
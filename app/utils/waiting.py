@@ -0,0 +1,254 @@
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from playwright.async_api import Page
+
+from app.core.settings import settings
+from app.utils.metrics import record_wait
+
+logger = logging.getLogger(__name__)
+
+
+# Ставит MutationObserver на элемент; промис завершается после затишья мутаций
+MUTATION_WATCH_SCRIPT = """
+([selector, key, quietMs]) => {
+    const waits = window.__parserWaits = window.__parserWaits || {};
+    const root = document.querySelector(selector);
+    if (!root) {
+        return false;
+    }
+    let observer = null;
+    const promise = new Promise((resolve) => {
+        let timer = null;
+        observer = new MutationObserver(() => {
+            clearTimeout(timer);
+            timer = setTimeout(() => {
+                observer.disconnect();
+                resolve(true);
+            }, quietMs);
+        });
+        observer.observe(root, { childList: true, subtree: true, characterData: true });
+    });
+    waits[key] = { promise, observer };
+    return true;
+}
+"""
+
+MUTATION_AWAIT_SCRIPT = """
+([key, timeoutMs]) => {
+    const waits = window.__parserWaits || {};
+    const wait = waits[key];
+    delete waits[key];
+    if (!wait) {
+        return false;
+    }
+    const timeout = new Promise((resolve) => setTimeout(() => resolve(false), timeoutMs));
+    return Promise.race([wait.promise, timeout]).then((changed) => {
+        wait.observer.disconnect();
+        return changed;
+    });
+}
+"""
+
+# Снимает наблюдатель, если действие не выполнилось и ждать нечего
+MUTATION_CANCEL_SCRIPT = """
+(key) => {
+    const waits = window.__parserWaits || {};
+    const wait = waits[key];
+    delete waits[key];
+    if (wait) {
+        wait.observer.disconnect();
+    }
+}
+"""
+
+_wait_keys = itertools.count()
+
+
+class WaitStats:
+    """Накопленное время ожиданий по меткам"""
+
+    def __init__(self):
+        self.count = 0
+        self.timeouts = 0
+        self.total = 0.0
+        self.by_label: Dict[str, Dict[str, float]] = {}
+
+    def record(self, label: str, seconds: float, timed_out: bool = False):
+        self.count += 1
+        self.total += seconds
+        stats = self.by_label.setdefault(
+            label, {"count": 0, "total": 0.0, "max": 0.0, "timeouts": 0}
+        )
+        stats["count"] += 1
+        stats["total"] += seconds
+        stats["max"] = max(stats["max"], seconds)
+        if timed_out:
+            self.timeouts += 1
+            stats["timeouts"] += 1
+
+    def summary(self) -> str:
+        parts = [
+            f"{label}: {stats['count']} за {stats['total']:.2f}с"
+            for label, stats in sorted(
+                self.by_label.items(), key=lambda item: -item[1]["total"]
+            )
+        ]
+        details = f" ({', '.join(parts)})" if parts else ""
+        return (
+            f"{self.count} ожиданий за {self.total:.2f}с, "
+            f"таймаутов: {self.timeouts}{details}"
+        )
+
+
+# Статистика за все время работы процесса
+wait_stats = WaitStats()
+
+_current_stats: ContextVar[Optional[WaitStats]] = ContextVar(
+    "current_wait_stats", default=None
+)
+
+
+def track_waits() -> WaitStats:
+    """Начинает учет ожиданий для текущей задачи (одного тендера)"""
+    stats = WaitStats()
+    _current_stats.set(stats)
+    return stats
+
+
+def _record(label: str, started: float, timed_out: bool):
+    seconds = time.perf_counter() - started
+    wait_stats.record(label, seconds, timed_out)
+    record_wait(label, seconds, timed_out)
+    current = _current_stats.get()
+    if current is not None:
+        current.record(label, seconds, timed_out)
+    logger.debug(
+        f"Ожидание '{label}': {seconds:.3f}с{' (таймаут)' if timed_out else ''}"
+    )
+
+
+async def wait_for_selector(
+    page: Page,
+    selector: str,
+    label: str,
+    state: str = "attached",
+    timeout: int = None,
+) -> bool:
+    """Ждет появления элемента, возвращает False по таймауту"""
+    started = time.perf_counter()
+    timed_out = False
+    try:
+        await page.wait_for_selector(
+            selector, state=state, timeout=timeout or settings.wait_timeout
+        )
+    except Exception as e:
+        timed_out = True
+        logger.debug(f"Не дождались '{selector}': {e}")
+    finally:
+        _record(label, started, timed_out)
+    return not timed_out
+
+
+async def wait_for_condition(
+    page: Page, expression: str, label: str, arg: Any = None, timeout: int = None
+) -> bool:
+    """Ждет выполнения JS-условия на странице, возвращает False по таймауту"""
+    started = time.perf_counter()
+    timed_out = False
+    try:
+        await page.wait_for_function(
+            expression, arg=arg, timeout=timeout or settings.wait_timeout
+        )
+    except Exception as e:
+        timed_out = True
+        logger.debug(f"Не дождались условия '{label}': {e}")
+    finally:
+        _record(label, started, timed_out)
+    return not timed_out
+
+
+@asynccontextmanager
+async def wait_for_mutation(
+    page: Page,
+    selector: str,
+    label: str,
+    quiet_ms: int = None,
+    timeout: int = None,
+):
+    """Ждет изменений DOM внутри элемента после действия в теле блока
+
+    Наблюдатель ставится до действия, ожидание завершается, когда мутации
+    стихли на quiet_ms миллисекунд.
+    """
+    key = f"wait{next(_wait_keys)}"
+    quiet_ms = quiet_ms if quiet_ms is not None else settings.wait_quiet_ms
+    watching = await page.evaluate(MUTATION_WATCH_SCRIPT, [selector, key, quiet_ms])
+
+    try:
+        yield
+    except BaseException:
+        if watching:
+            try:
+                await page.evaluate(MUTATION_CANCEL_SCRIPT, key)
+            except Exception as e:
+                logger.debug(f"Не удалось снять наблюдатель '{selector}': {e}")
+        raise
+
+    started = time.perf_counter()
+    timed_out = False
+    try:
+        if watching:
+            changed = await page.evaluate(
+                MUTATION_AWAIT_SCRIPT, [key, timeout or settings.wait_timeout]
+            )
+            timed_out = not changed
+        else:
+            # Элемента не было - ждем, пока он появится
+            await page.wait_for_selector(
+                selector, state="attached", timeout=timeout or settings.wait_timeout
+            )
+    except Exception as e:
+        # Таймаут появления элемента или действие привело к навигации
+        # и контекст страницы сменился
+        timed_out = True
+        logger.debug(f"Ожидание изменений '{selector}' прервано: {e}")
+    finally:
+        _record(label, started, timed_out)
+
+
+@asynccontextmanager
+async def wait_for_xhr(page: Page, url_part: str, label: str, timeout: int = None):
+    """Ждет ответа на XHR/fetch запрос после действия в теле блока
+
+    Учитываются запросы, URL которых содержит url_part (пустая строка - любой
+    XHR/fetch). Таймаут не пробрасывается, он только записывается в статистику.
+    """
+
+    def is_expected(response) -> bool:
+        return url_part in response.url and response.request.resource_type in (
+            "xhr",
+            "fetch",
+        )
+
+    started = None
+    timed_out = False
+    try:
+        async with page.expect_response(
+            is_expected, timeout=timeout or settings.wait_timeout
+        ):
+            yield
+            started = time.perf_counter()
+    except Exception as e:
+        if started is None:
+            # Ошибка в самом действии - пробрасываем
+            raise
+        timed_out = True
+        logger.debug(f"Не дождались ответа '{url_part}': {e}")
+    finally:
+        if started is not None:
+            _record(label, started, timed_out)
@@ -0,0 +1,76 @@
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from playwright.async_api import Page
+
+from app.parsers.all_tender_info import get_tender
+from app.parsers.parse_context import ParseContext
+from app.parsers.tender_feature_parsers.delivery_features.address import get_delivery_address
+from app.parsers.tender_feature_parsers.delivery_features.conditions import get_delivery_conditions
+from app.parsers.tender_feature_parsers.delivery_features.term import get_delivery_term
+from app.parsers.tender_feature_parsers.documents_info import get_tender_documents
+from app.parsers.tender_feature_parsers.general_requirements import get_general_requirements
+from app.parsers.tender_feature_parsers.items_info import get_tender_items
+from app.parsers.tender_feature_parsers.payment_features.conditions import get_payment_conditions
+from app.parsers.tender_feature_parsers.payment_features.method import get_payment_method
+from app.parsers.tender_feature_parsers.payment_features.term import get_payment_term
+from app.parsers.tender_feature_parsers.tender_features.customer_name import get_customer_name
+from app.parsers.tender_feature_parsers.tender_features.financing_source import get_financing_source
+from app.parsers.tender_feature_parsers.tender_features.max_price import get_price_info
+from app.parsers.tender_feature_parsers.tender_features.purchase_type import get_purchase_type
+from app.parsers.tender_feature_parsers.tender_features.tender_name import get_tender_name
+from app.parsers.tender_feature_parsers.tender_features.tender_number import get_tender_number
+
+
+@dataclass
+class Case:
+    """Случай бенчмарка
+
+    scope:
+        page   - функция получает страницу общей информации (перезагружается
+                 перед каждым замером)
+        ctx    - то же, но через новый ParseContext
+        url    - функция получает URL тендера и сама открывает страницы
+    """
+
+    name: str
+    scope: str
+    run: Callable[..., Awaitable]
+
+
+CASES = [
+    # tender_features/*
+    Case("tender_name", "page", get_tender_name),
+    Case("tender_number", "page", get_tender_number),
+    Case("customer_name", "page", get_customer_name),
+    Case("purchase_type", "page", get_purchase_type),
+    Case("max_price", "page", get_price_info),
+    Case("financing_source", "ctx", get_financing_source),
+    # delivery_features/*
+    Case("delivery_address", "ctx", get_delivery_address),
+    Case("delivery_term", "ctx", get_delivery_term),
+    Case("delivery_conditions", "ctx", get_delivery_conditions),
+    # payment_features/*
+    Case("payment_term", "ctx", get_payment_term),
+    Case("payment_method", "ctx", get_payment_method),
+    Case("payment_conditions", "ctx", get_payment_conditions),
+    Case("general_requirements", "ctx", get_general_requirements),
+    # items_info (обычные или медицинские - по фикстуре)
+    Case("items", "page", get_tender_items),
+    Case("documents", "url", get_tender_documents),
+    Case("get_tender", "url", get_tender),
+]
+
+
+async def run_case(case: Case, page: Page, url: str):
+    if case.scope == "page":
+        return await case.run(page)
+    if case.scope == "ctx":
+        return await case.run(ParseContext(page))
+    return await case.run(url)
+
+
+async def items_case_name(page: Page) -> str:
+    """items_regular или items_medical по содержимому страницы"""
+    is_medical = await page.query_selector("[id^='medTable']") is not None
+    return "items_medical" if is_medical else "items_regular"
@@ -0,0 +1,74 @@
+import json
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from app.core.settings import settings
+from app.utils.har_replay import get_har_replay
+from app.utils.http_client import http_client
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+@dataclass
+class Fixture:
+    """Записанный тендер: HAR с трафиком и ожидаемый результат парсинга
+
+    Файлы в каталоге фикстур:
+        <regNumber>.har            - трафик браузера
+        <regNumber>.meta.json      - URL и время записи
+        <regNumber>.expected.json  - TenderData на момент записи
+    """
+
+    reg_number: str
+    url: str
+    har_path: Path
+    expected_path: Path
+
+    def expected(self) -> Optional[dict]:
+        if not self.expected_path.exists():
+            return None
+        return json.loads(self.expected_path.read_text(encoding="utf-8"))
+
+
+def fixture_paths(reg_number: str, directory: Path = FIXTURES_DIR) -> dict:
+    return {
+        "har": directory / f"{reg_number}.har",
+        "meta": directory / f"{reg_number}.meta.json",
+        "expected": directory / f"{reg_number}.expected.json",
+    }
+
+
+def list_fixtures(directory: Path = FIXTURES_DIR) -> List[Fixture]:
+    """Все фикстуры каталога в порядке regNumber"""
+    fixtures = []
+    for meta_path in sorted(directory.glob("*.meta.json")):
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        paths = fixture_paths(meta["regNumber"], directory)
+        if paths["har"].exists():
+            fixtures.append(
+                Fixture(
+                    reg_number=meta["regNumber"],
+                    url=meta["url"],
+                    har_path=paths["har"],
+                    expected_path=paths["expected"],
+                )
+            )
+    return fixtures
+
+
+@asynccontextmanager
+async def replay_fixture(fixture: Fixture, latency_ms: int = 0):
+    """Все запросы браузера и HTTP-клиента обслуживаются из записи фикстуры"""
+    previous = (settings.har_replay_path, settings.replay_latency_ms)
+    settings.har_replay_path = str(fixture.har_path)
+    settings.replay_latency_ms = latency_ms
+    # Клиент пересоздается с транспортом, читающим запись
+    await http_client.stop()
+    get_har_replay().reset()
+    try:
+        yield get_har_replay()
+    finally:
+        settings.har_replay_path, settings.replay_latency_ms = previous
+        await http_client.stop()
@@ -0,0 +1,166 @@
+import os
+import resource
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, List
+
+from playwright._impl._connection import Connection
+
+# Сообщения объектов перехвата (route.fulfill/continue) - работа слоя
+# воспроизведения, а не парсеров; в обращения к браузеру не считаются
+_IGNORED_TYPES = {"Route"}
+
+
+class RoundTripCounter:
+    """Считает сообщения клиента Playwright браузеру
+
+    Использует внутренний метод Connection._send_message_to_server: через
+    него проходит каждый вызов API (query_selector, text_content, click...).
+    Только для бенчмарков.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._original = None
+
+    def install(self):
+        if self._original is not None:
+            return
+        original = Connection._send_message_to_server
+        counter = self
+
+        def counting(connection, object, method, params, no_reply=False):
+            if getattr(object, "_type", None) not in _IGNORED_TYPES:
+                counter.count += 1
+            return original(connection, object, method, params, no_reply)
+
+        self._original = original
+        Connection._send_message_to_server = counting
+
+    def uninstall(self):
+        if self._original is not None:
+            Connection._send_message_to_server = self._original
+            self._original = None
+
+
+round_trips = RoundTripCounter()
+
+
+def _tree_rss_bytes(root_pid: int) -> int:
+    """RSS процесса и всех его потомков (Chromium) по /proc"""
+    parents: Dict[int, int] = {}
+    rss: Dict[int, int] = {}
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+            with open(f"/proc/{entry}/statm") as f:
+                resident = int(f.read().split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        # Имя процесса в скобках может содержать пробелы
+        fields = stat.rsplit(")", 1)[1].split()
+        parents[int(entry)] = int(fields[1])
+        rss[int(entry)] = resident * page_size
+
+    total = 0
+    stack = [root_pid]
+    seen = set()
+    while stack:
+        pid = stack.pop()
+        if pid in seen:
+            continue
+        seen.add(pid)
+        total += rss.get(pid, 0)
+        stack.extend(child for child, parent in parents.items() if parent == pid)
+    return total
+
+
+class RssSampler:
+    """Пиковый RSS дерева процессов за время замера (фоновый поток)"""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._use_proc = os.path.isdir("/proc")
+
+    def _sample(self):
+        if self._use_proc:
+            self.peak = max(self.peak, _tree_rss_bytes(os.getpid()))
+        else:
+            # Без /proc доступен только пик текущего процесса (КБ в Linux)
+            self.peak = max(
+                self.peak, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+            )
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self) -> "RssSampler":
+        self._sample()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+
+@contextmanager
+def counting_round_trips():
+    round_trips.install()
+    try:
+        yield round_trips
+    finally:
+        round_trips.uninstall()
+
+
+async def measure(
+    run: Callable[[], Awaitable],
+    prepare: Callable[[], Awaitable] = None,
+    repeat: int = 1,
+    settle: Callable[[], Awaitable] = None,
+) -> dict:
+    """Замер одного случая: медиана времени и обращений, пик RSS
+
+    prepare выполняется перед каждым повтором и в замер не входит.
+    settle дожидается фоновой работы (например, пула браузеров): перед
+    повтором - чтобы чужие сообщения не попали в замер, после run - чтобы
+    работа, начатая самим случаем, учитывалась всегда целиком. Время
+    ожидания после run в wall_ms не входит.
+    """
+    walls: List[float] = []
+    trips: List[int] = []
+    peak = 0
+
+    for _ in range(repeat):
+        if prepare is not None:
+            await prepare()
+        if settle is not None:
+            await settle()
+
+        with RssSampler() as sampler:
+            before = round_trips.count
+            started = time.perf_counter()
+            await run()
+            walls.append((time.perf_counter() - started) * 1000)
+            if settle is not None:
+                await settle()
+            trips.append(round_trips.count - before)
+        peak = max(peak, sampler.peak)
+
+    return {
+        "wall_ms": round(statistics.median(walls), 1),
+        "round_trips": int(statistics.median(trips)),
+        "peak_rss_mb": round(peak / 1024 / 1024, 1),
+    }
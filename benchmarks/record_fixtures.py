@@ -0,0 +1,76 @@
+"""Запись фикстур тендеров для офлайн-прогонов
+
+    python -m benchmarks.record_fixtures URL [URL ...] [--out DIR]
+
+Тендер парсится через браузер с записью всего трафика в HAR (общая
+информация, документы, пагинация, строки truInfo_*/medInfo*). Быстрые
+HTTP-пути на время записи отключаются, чтобы в записи были все страницы.
+"""
+import argparse
+import asyncio
+import json
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+
+from app.core.settings import settings
+from app.parsers.all_tender_info import get_tender
+from app.utils.validator import extract_reg_number, validate_tender_url
+from benchmarks.fixtures import FIXTURES_DIR, fixture_paths
+
+logger = logging.getLogger(__name__)
+
+
+async def record_fixture(url: str, directory: Path = FIXTURES_DIR):
+    """Записывает трафик и результат парсинга одного тендера"""
+    is_valid, error = validate_tender_url(url)
+    if not is_valid:
+        raise ValueError(error)
+
+    reg_number = extract_reg_number(url)
+    paths = fixture_paths(reg_number, directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    settings.har_record_path = str(paths["har"])
+    settings.har_replay_path = None
+    settings.common_info_http_fast_path = False
+    settings.documents_http_fast_path = False
+    try:
+        # Пул не запущен: get_page создает свой контекст и сохраняет HAR при закрытии
+        tender = await get_tender(url)
+    finally:
+        settings.har_record_path = None
+
+    paths["expected"].write_text(
+        tender.model_dump_json(indent=2), encoding="utf-8"
+    )
+    paths["meta"].write_text(
+        json.dumps(
+            {
+                "regNumber": reg_number,
+                "url": url,
+                "recordedAt": datetime.now(timezone.utc).isoformat(),
+            },
+            ensure_ascii=False,
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+    logger.info(f"Фикстура {reg_number} записана: {paths['har']}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Запись фикстур тендеров")
+    parser.add_argument("urls", nargs="+", help="Ссылки на тендеры")
+    parser.add_argument("--out", type=Path, default=FIXTURES_DIR, help="Каталог фикстур")
+    args = parser.parse_args()
+
+    for url in args.urls:
+        await record_fixture(url, args.out)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    asyncio.run(main())
@@ -0,0 +1,62 @@
+"""Прогон записанных фикстур без сети
+
+    python -m benchmarks.replay [--latency MS] [--dir DIR]
+
+Каждый тендер парсится с ответами из HAR (с искусственной задержкой на
+каждый запрос) и сравнивается с результатом, сохраненным при записи.
+Код возврата 1, если хоть один результат отличается.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+
+from app.parsers.all_tender_info import get_tender
+from benchmarks.fixtures import FIXTURES_DIR, list_fixtures, replay_fixture
+
+logger = logging.getLogger(__name__)
+
+
+async def replay_all(directory: Path, latency_ms: int) -> bool:
+    fixtures = list_fixtures(directory)
+    if not fixtures:
+        logger.warning(f"Нет фикстур в {directory}")
+        return True
+
+    ok = True
+    for fixture in fixtures:
+        async with replay_fixture(fixture, latency_ms) as replay:
+            tender = await get_tender(fixture.url)
+
+        actual = json.loads(tender.model_dump_json())
+        expected = fixture.expected()
+        if expected is not None and actual != expected:
+            ok = False
+            logger.error(f"{fixture.reg_number}: результат отличается от записанного")
+        else:
+            logger.info(f"{fixture.reg_number}: совпадает")
+
+        if replay.misses:
+            logger.warning(
+                f"{fixture.reg_number}: нет записи для {len(replay.misses)} запросов, "
+                f"например {replay.misses[0]}"
+            )
+    return ok
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Прогон фикстур без сети")
+    parser.add_argument("--latency", type=int, default=0, help="Задержка ответа, мс")
+    parser.add_argument("--dir", type=Path, default=FIXTURES_DIR, help="Каталог фикстур")
+    args = parser.parse_args()
+
+    return 0 if await replay_all(args.dir, args.latency) else 1
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    sys.exit(asyncio.run(main()))
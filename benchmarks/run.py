@@ -0,0 +1,164 @@
+"""Бенчмарки парсеров на записанных фикстурах
+
+    python -m benchmarks.run [--repeat N] [--latency MS] [--only NAME] [--update]
+
+Для каждой фикстуры (см. benchmarks.record_fixtures) замеряются все случаи
+из benchmarks.cases: время, число обращений к браузеру и пиковый RSS.
+Результаты сравниваются с baselines.json; при регрессии печатается
+разница и код возврата 1. С --update базовые значения перезаписываются.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+from app.utils.browser_pool import browser_pool
+from app.utils.create_driver import get_page
+from benchmarks.cases import CASES, items_case_name, run_case
+from benchmarks.fixtures import FIXTURES_DIR, Fixture, list_fixtures, replay_fixture
+from benchmarks.measure import counting_round_trips, measure
+
+logger = logging.getLogger(__name__)
+
+BASELINES_PATH = Path(__file__).parent / "baselines.json"
+
+# Допуски: время и память шумят, число обращений к браузеру - нет
+WALL_TOLERANCE = 0.25
+WALL_SLACK_MS = 50.0
+RSS_TOLERANCE = 0.2
+ROUND_TRIPS_TOLERANCE = 0
+
+
+async def bench_fixture(
+    fixture: Fixture, repeat: int, latency_ms: int, only: List[str]
+) -> Dict[str, dict]:
+    results = {}
+    async with replay_fixture(fixture, latency_ms) as replay:
+        # Пул поднимается после включения воспроизведения: контексты берут ответы из записи
+        await browser_pool.start()
+        try:
+            async with get_page() as page:
+                for case in CASES:
+                    name = case.name
+                    if name == "items":
+                        await page.goto(fixture.url)
+                        name = await items_case_name(page)
+                    if only and not any(part in name for part in only):
+                        continue
+
+                    async def prepare():
+                        # Каждый повтор получает записанные ответы с начала
+                        replay.reset()
+                        if case.scope != "url":
+                            await page.goto(fixture.url)
+
+                    results[f"{fixture.reg_number}/{name}"] = await measure(
+                        lambda: run_case(case, page, fixture.url),
+                        prepare,
+                        repeat,
+                        # Сброс и пополнение контекстов пула идут в фоне и иначе
+                        # попадали бы в число обращений следующего повтора
+                        settle=browser_pool.drain,
+                    )
+                    logger.info(f"{fixture.reg_number}/{name}: {results[f'{fixture.reg_number}/{name}']}")
+        finally:
+            await browser_pool.stop()
+    return results
+
+
+def compare(baselines: Dict[str, dict], results: Dict[str, dict]) -> List[str]:
+    """Строки с регрессиями относительно базовых значений"""
+    regressions = []
+    for key, result in sorted(results.items()):
+        baseline = baselines.get(key)
+        if baseline is None:
+            continue
+
+        if result["round_trips"] > baseline["round_trips"] + ROUND_TRIPS_TOLERANCE:
+            regressions.append(
+                f"{key}: round_trips {baseline['round_trips']} -> {result['round_trips']}"
+            )
+        wall_limit = max(
+            baseline["wall_ms"] * (1 + WALL_TOLERANCE), baseline["wall_ms"] + WALL_SLACK_MS
+        )
+        if result["wall_ms"] > wall_limit:
+            regressions.append(
+                f"{key}: wall_ms {baseline['wall_ms']} -> {result['wall_ms']} "
+                f"(допуск {wall_limit:.1f})"
+            )
+        if result["peak_rss_mb"] > baseline["peak_rss_mb"] * (1 + RSS_TOLERANCE):
+            regressions.append(
+                f"{key}: peak_rss_mb {baseline['peak_rss_mb']} -> {result['peak_rss_mb']}"
+            )
+    return regressions
+
+
+def print_table(results: Dict[str, dict], baselines: Dict[str, dict]):
+    print(f"{'case':<45} {'wall_ms':>10} {'trips':>7} {'rss_mb':>8}   baseline")
+    for key, result in sorted(results.items()):
+        baseline = baselines.get(key)
+        reference = (
+            f"{baseline['wall_ms']:.1f} / {baseline['round_trips']} / {baseline['peak_rss_mb']}"
+            if baseline
+            else "-"
+        )
+        print(
+            f"{key:<45} {result['wall_ms']:>10.1f} {result['round_trips']:>7} "
+            f"{result['peak_rss_mb']:>8.1f}   {reference}"
+        )
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарки парсеров на фикстурах")
+    parser.add_argument("--repeat", type=int, default=3, help="Повторов на случай")
+    parser.add_argument("--latency", type=int, default=0, help="Задержка ответа, мс")
+    parser.add_argument("--only", action="append", default=[], help="Фильтр по имени случая")
+    parser.add_argument("--dir", type=Path, default=FIXTURES_DIR, help="Каталог фикстур")
+    parser.add_argument("--baselines", type=Path, default=BASELINES_PATH)
+    parser.add_argument("--update", action="store_true", help="Перезаписать базовые значения")
+    args = parser.parse_args()
+
+    fixtures = list_fixtures(args.dir)
+    if not fixtures:
+        logger.error(f"Нет фикстур в {args.dir}, запишите их через benchmarks.record_fixtures")
+        return 1
+
+    results: Dict[str, dict] = {}
+    with counting_round_trips():
+        for fixture in fixtures:
+            results.update(await bench_fixture(fixture, args.repeat, args.latency, args.only))
+
+    baselines = (
+        json.loads(args.baselines.read_text(encoding="utf-8"))
+        if args.baselines.exists()
+        else {}
+    )
+    print_table(results, baselines)
+
+    if args.update:
+        baselines.update(results)
+        args.baselines.write_text(
+            json.dumps(baselines, ensure_ascii=False, indent=2, sort_keys=True) + "\n",
+            encoding="utf-8",
+        )
+        logger.info(f"Базовые значения сохранены: {args.baselines}")
+        return 0
+
+    regressions = compare(baselines, results)
+    if regressions:
+        print("\nРегрессии:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.WARNING, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    logger.setLevel(logging.INFO)
+    sys.exit(asyncio.run(main()))